@@ -10,7 +10,7 @@ from django.utils import timezone
 logger = logging.getLogger(__name__)
 
 
-@shared_task(queue='maintenance')
+@shared_task(queue='maintenance', time_limit=30 * 60, soft_time_limit=29 * 60)
 def cleanup_old_logs(days_to_keep: int = 90):
     """
     Clean up old notification logs.
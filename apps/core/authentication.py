@@ -1,10 +1,19 @@
 """
 Authentication classes for internal service-to-service communication.
 """
+import hmac
+from functools import lru_cache
+
 from rest_framework import authentication, exceptions
 from django.conf import settings
 
 
+@lru_cache(maxsize=1)
+def _secret_bytes(secret: str) -> bytes:
+    """Encode the shared secret once (keyed on its value, so overrides work)."""
+    return secret.encode()
+
+
 class InternalServiceAuthentication(authentication.BaseAuthentication):
     """
     Authentication for internal services using API Key in headers.
@@ -35,7 +44,10 @@ class InternalServiceAuthentication(authentication.BaseAuthentication):
         if not api_key:
             return None  # No header = don't attempt to authenticate
 
-        if api_key != settings.INTERNAL_API_SECRET_KEY:
+        # Constant-time comparison: don't leak the secret through timing
+        if not hmac.compare_digest(
+            api_key.encode(), _secret_bytes(settings.INTERNAL_API_SECRET_KEY)
+        ):
             raise exceptions.AuthenticationFailed('Invalid internal API key')
 
         # Return user=None, auth=None (authenticated but no user object)
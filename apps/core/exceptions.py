@@ -45,3 +45,13 @@ class MaxRetriesExceededError(NotificationServiceError):
 class InvalidEventPayloadError(NotificationServiceError):
     """Raised when the event payload is invalid."""
     pass
+
+
+class DatabaseCircuitOpenError(NotificationServiceError):
+    """Raised when the database circuit breaker is open (fail fast)."""
+    pass
+
+
+class VehicleNotFoundError(NotificationServiceError):
+    """Raised when a synced payload references a vehicle that does not exist."""
+    pass
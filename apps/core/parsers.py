@@ -0,0 +1,20 @@
+"""
+orjson-based JSON parser for Django REST Framework.
+"""
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+
+class ORJSONParser(JSONParser):
+    """
+    Drop-in replacement for JSONParser using orjson (C implementation).
+
+    Request bodies must be UTF-8, as required by RFC 8259.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
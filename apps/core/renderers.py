@@ -0,0 +1,28 @@
+"""
+orjson-based JSON renderer for Django REST Framework.
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Reused for the types orjson does not serialize natively (Decimal, lazy
+# translation strings, QuerySets, ...), exactly as DRF's JSONRenderer does.
+_drf_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for JSONRenderer using orjson (C implementation).
+
+    Output is compact UTF-8 JSON, like JSONRenderer with its default
+    settings. The indent requested via the Accept header is ignored.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(
+            data,
+            default=_drf_encoder.default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-16 10:00
+
+import django.db.models.functions.comparison
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0005_add_vehicle_phase_config"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notificationtemplate",
+            index=models.Index(
+                django.db.models.functions.comparison.Coalesce(
+                    "subtype", models.Value(uuid.UUID("00000000-0000-0000-0000-000000000000"))
+                ),
+                name="tmpl_subtype_coalesce_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.9 on 2026-10-16 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0006_notificationtemplate_tmpl_subtype_coalesce_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notificationtemplate",
+            index=models.Index(
+                condition=models.Q(("subtype__isnull", True)),
+                fields=["service_type", "phase", "channel", "target"],
+                name="tmpl_generic_context_idx",
+            ),
+        ),
+    ]
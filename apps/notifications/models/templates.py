@@ -1,12 +1,19 @@
 """
 Notification template models.
 """
+import uuid
+
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 
 from apps.core.models import BaseModel
 from apps.core.constants import NotificationChannel, NotificationTarget
 
+# Sentinel used to fold "no subtype" into the same value space as real subtype
+# ids, so "subtype X or generic" becomes an IN lookup instead of an OR/IS NULL.
+NULL_SUBTYPE_ID = uuid.UUID(int=0)
+
 
 class NotificationTemplate(BaseModel):
     """
@@ -96,6 +103,15 @@ class NotificationTemplate(BaseModel):
             models.Index(fields=["is_active", "channel"]),
             models.Index(fields=["service_type", "phase", "channel"]),
             models.Index(fields=["service_type", "subtype", "phase"]),
+            models.Index(
+                Coalesce("subtype", models.Value(NULL_SUBTYPE_ID)),
+                name="tmpl_subtype_coalesce_idx",
+            ),
+            models.Index(
+                fields=["service_type", "phase", "channel", "target"],
+                condition=models.Q(subtype__isnull=True),
+                name="tmpl_generic_context_idx",
+            ),
         ]
         verbose_name = "Notification Template"
         verbose_name_plural = "Notification Templates"
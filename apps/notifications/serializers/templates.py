@@ -60,7 +60,7 @@ class NotificationTemplateSerializer(serializers.ModelSerializer):
 
     def get_subtype_name(self, obj) -> str | None:
         """Get the subtype name if exists."""
-        return obj.subtype.name if obj.subtype else None
+        return obj.subtype.name if obj.subtype_id else None
 
 
 class NotificationTemplateCreateSerializer(serializers.ModelSerializer):
@@ -139,7 +139,7 @@ def send_notification_task(self, log_id: str):
             raise self.retry(countdown=retry_delay)
 
 
-@shared_task(queue='maintenance')
+@shared_task(queue='maintenance', time_limit=30 * 60, soft_time_limit=29 * 60)
 def check_maintenance_reminders():
     """
     Periodic task to check and send maintenance reminders.
@@ -2,6 +2,7 @@
 Views for notification templates.
 """
 from django.db import models
+from django.db.models.functions import Coalesce
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -9,6 +10,7 @@ from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiPara
 
 from apps.core.constants import TEMPLATE_VARIABLES
 from apps.notifications.models import NotificationTemplate
+from apps.notifications.models.templates import NULL_SUBTYPE_ID
 from apps.notifications.serializers.templates import (
     NotificationTemplateSerializer,
     NotificationTemplateCreateSerializer,
@@ -22,6 +24,14 @@ from apps.notifications.services.template_service import template_service
     list=extend_schema(
         summary="List notification templates",
         description="Get all notification templates, optionally filtered by channel or target.",
+        parameters=[
+            OpenApiParameter(
+                "expand",
+                str,
+                required=False,
+                description="Use 'subtype' to JOIN the subtype in the main query"
+            ),
+        ],
         tags=["Templates"],
     ),
     retrieve=extend_schema(
@@ -59,8 +69,17 @@ class NotificationTemplateViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         queryset = NotificationTemplate.objects.select_related(
-            "service_type", "phase", "subtype"
-        ).all()
+            "service_type", "phase"
+        )
+
+        # Most templates are generic (subtype IS NULL): only JOIN subtype when
+        # the caller filters/expands by it, otherwise resolve the few non-null
+        # subtypes with a single IN query.
+        subtype_id = self.request.query_params.get("subtype_id")
+        if subtype_id or self.request.query_params.get("expand") == "subtype":
+            queryset = queryset.select_related("subtype")
+        else:
+            queryset = queryset.prefetch_related("subtype")
 
         # Filter by channel
         channel = self.request.query_params.get("channel")
@@ -93,16 +112,24 @@ class NotificationTemplateViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(phase_id=phase_id)
 
         # Filter by subtype (includes templates without subtype)
-        subtype_id = self.request.query_params.get("subtype_id")
         if subtype_id:
             # Include templates specific to the subtype OR generic (no subtype)
-            queryset = queryset.filter(
-                models.Q(subtype_id=subtype_id) |
-                models.Q(subtype__isnull=True)
-            )
+            queryset = self._filter_subtype_or_generic(queryset, subtype_id)
 
         return queryset.order_by("-created_at")
 
+    @staticmethod
+    def _filter_subtype_or_generic(queryset, subtype_id):
+        """
+        Keep templates for the given subtype plus generic ones (no subtype).
+
+        Coalesces NULL subtypes to NULL_SUBTYPE_ID so the predicate is a single
+        IN lookup served by tmpl_subtype_coalesce_idx instead of an OR branch.
+        """
+        return queryset.annotate(
+            eff_subtype=Coalesce("subtype", models.Value(NULL_SUBTYPE_ID))
+        ).filter(eff_subtype__in=[subtype_id, NULL_SUBTYPE_ID])
+
     @extend_schema(
         summary="Preview a template",
         description="Render a template with example or provided values.",
@@ -226,7 +253,7 @@ class NotificationTemplateViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        queryset = NotificationTemplate.objects.select_related(
+        base = NotificationTemplate.objects.select_related(
             "service_type", "phase", "subtype"
         ).filter(
             service_type_id=service_type_id,
@@ -234,17 +261,15 @@ class NotificationTemplateViewSet(viewsets.ModelViewSet):
             channel=channel,
             target=target,
             is_active=True
-        )
+        ).order_by()
+
+        # Only include templates without subtype (served by tmpl_generic_context_idx)
+        queryset = base.filter(subtype__isnull=True)
 
         if subtype_id:
-            # Include templates specific to the subtype OR generic (no subtype)
-            queryset = queryset.filter(
-                models.Q(subtype_id=subtype_id) |
-                models.Q(subtype__isnull=True)
-            )
-        else:
-            # Only include templates without subtype
-            queryset = queryset.filter(subtype__isnull=True)
+            # Include templates specific to the subtype AND generic ones.
+            # Two disjoint legs let each use its own index instead of OR/IS NULL.
+            queryset = base.filter(subtype_id=subtype_id).union(queryset, all=True)
 
         # Order by subtype (specific first, then generic)
         queryset = queryset.order_by("-subtype_id", "-is_default", "name")
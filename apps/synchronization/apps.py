@@ -10,3 +10,7 @@ class SynchronizationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.synchronization"
     verbose_name = "Data Synchronization"
+
+    def ready(self):
+        # Import signals when app is ready
+        from . import signals  # noqa: F401
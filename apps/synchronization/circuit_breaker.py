@@ -0,0 +1,148 @@
+"""
+Circuit breaker de base de datos para la sincronización con Core.
+
+Durante una caída de Postgres cada webhook termina en OperationalError y
+se reintenta, llenando el broker de tareas condenadas a fallar. El breaker
+cuenta fallos en Redis (compartido entre workers y web) y, al superar el
+umbral, se abre durante DB_BREAKER_RECOVERY_TIMEOUT segundos:
+
+- CLOSED: las operaciones se ejecutan normalmente.
+- OPEN: se lanza DatabaseCircuitOpenError sin tocar la base de datos.
+- HALF_OPEN: al expirar el timeout se permiten operaciones; el contador
+  queda a un fallo del umbral, así que un solo fallo lo vuelve a abrir y la
+  primera operación exitosa lo reinicia (vuelve a CLOSED).
+
+El estado se lee con un único MGET y se cachea en el proceso durante
+DB_BREAKER_STATE_CACHE_SECONDS, para no sumar una consulta a Redis en la vista
+y otra en la tarea por cada webhook.
+"""
+import logging
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import InterfaceError, OperationalError
+
+from apps.core.exceptions import DatabaseCircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# Fallos dentro de la ventana que abren el circuito
+DB_BREAKER_FAILURE_THRESHOLD = 10
+
+# Ventana de conteo de fallos (segundos)
+DB_BREAKER_FAILURE_WINDOW = 60
+
+# Tiempo que el circuito permanece abierto antes de pasar a HALF_OPEN (segundos)
+DB_BREAKER_RECOVERY_TIMEOUT = 30
+
+# Tiempo que cada proceso reutiliza el estado leído de Redis (segundos)
+DB_BREAKER_STATE_CACHE_SECONDS = 1
+
+# SQLSTATE lock_not_available: SELECT ... FOR UPDATE NOWAIT sobre una fila ya
+# bloqueada. Es contención entre syncs de la misma entidad, no una caída de la BD
+_LOCK_NOT_AVAILABLE = "55P03"
+
+_FAILURES_KEY = "sync:db-breaker:failures"
+_OPEN_KEY = "sync:db-breaker:open"
+# Presente desde que el circuito se abre hasta que una operación tiene éxito
+_TRIPPED_KEY = "sync:db-breaker:tripped"
+
+# Estado cacheado en el proceso: (expira_en, abierto, disparado)
+_state = (0.0, False, False)
+
+
+def _read_state() -> tuple[bool, bool]:
+    """
+    Devolver (abierto, disparado), leyendo Redis como mucho una vez por segundo.
+
+    Si Redis no está disponible se considera cerrado (fail-open): el breaker
+    solo protege, nunca debe impedir la sincronización por sí mismo.
+    """
+    global _state
+    expires_at, is_open, tripped = _state
+    now = time.monotonic()
+    if now < expires_at:
+        return is_open, tripped
+
+    try:
+        values = cache.get_many([_OPEN_KEY, _TRIPPED_KEY])
+        is_open, tripped = bool(values.get(_OPEN_KEY)), bool(values.get(_TRIPPED_KEY))
+    except Exception as exc:
+        logger.warning(f"DB circuit breaker state unavailable: {exc}")
+        is_open, tripped = False, False
+
+    _state = (now + DB_BREAKER_STATE_CACHE_SECONDS, is_open, tripped)
+    return is_open, tripped
+
+
+def db_circuit_is_open() -> bool:
+    """Indicar si el circuito está abierto (fail-open si Redis no responde)."""
+    return _read_state()[0]
+
+
+def _is_lock_contention(exc: Exception) -> bool:
+    """Indicar si el error de BD es un lock ocupado (NOWAIT), no un fallo."""
+    cause = exc.__cause__
+    return _LOCK_NOT_AVAILABLE in (
+        getattr(cause, "sqlstate", None),  # psycopg 3
+        getattr(cause, "pgcode", None),  # psycopg2
+    )
+
+
+def _record_failure() -> None:
+    """Contar un fallo de base de datos y abrir el circuito si corresponde."""
+    global _state
+    try:
+        cache.add(_FAILURES_KEY, 0, timeout=DB_BREAKER_FAILURE_WINDOW)
+        failures = cache.incr(_FAILURES_KEY)
+        if failures < DB_BREAKER_FAILURE_THRESHOLD:
+            return
+
+        half_open_timeout = DB_BREAKER_RECOVERY_TIMEOUT + DB_BREAKER_FAILURE_WINDOW
+        cache.set(_OPEN_KEY, 1, timeout=DB_BREAKER_RECOVERY_TIMEOUT)
+        cache.set(_TRIPPED_KEY, 1, timeout=half_open_timeout)
+        # Dejar el contador a un fallo del umbral durante el HALF_OPEN
+        cache.set(_FAILURES_KEY, DB_BREAKER_FAILURE_THRESHOLD - 1, timeout=half_open_timeout)
+        _state = (time.monotonic() + DB_BREAKER_STATE_CACHE_SECONDS, True, True)
+        logger.error(
+            f"DB circuit breaker OPEN after {failures} failures; "
+            f"failing fast for {DB_BREAKER_RECOVERY_TIMEOUT}s"
+        )
+    except Exception as exc:
+        logger.warning(f"DB circuit breaker unavailable: {exc}")
+
+
+def _record_success() -> None:
+    """Cerrar el circuito tras la primera operación exitosa en HALF_OPEN."""
+    global _state
+    try:
+        cache.delete_many([_FAILURES_KEY, _TRIPPED_KEY])
+        logger.info("DB circuit breaker CLOSED after a successful operation")
+    except Exception as exc:
+        logger.warning(f"DB circuit breaker unavailable: {exc}")
+    _state = (time.monotonic() + DB_BREAKER_STATE_CACHE_SECONDS, False, False)
+
+
+@contextmanager
+def db_circuit_breaker():
+    """
+    Proteger un bloque (o función, usado como decorador) de escrituras en BD.
+
+    Raises:
+        DatabaseCircuitOpenError: Si el circuito está abierto. No está en
+            autoretry_for de las tareas de sync, por lo que falla de inmediato.
+        OperationalError / InterfaceError: Se propagan tras contarse como fallo
+            (salvo un lock ocupado por NOWAIT, que no indica una caída de la BD).
+    """
+    is_open, tripped = _read_state()
+    if is_open:
+        raise DatabaseCircuitOpenError("Database circuit breaker is open")
+    try:
+        yield
+    except (OperationalError, InterfaceError) as exc:
+        if not _is_lock_contention(exc):
+            _record_failure()
+        raise
+    if tripped:
+        _record_success()
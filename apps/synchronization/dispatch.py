@@ -0,0 +1,168 @@
+"""
+Despacho de tareas de sync a Celery, opcionalmente en lotes.
+
+Con SYNC_BATCH_MS > 0 el view no espera el round-trip al broker: el task_id
+se genera localmente, el mensaje se agrega a un buffer en memoria y un hilo
+de fondo lo publica junto con el resto del lote cada SYNC_BATCH_MS
+milisegundos, reutilizando un único producer (una conexión al broker).
+
+Con el transporte Redis de kombu cada mensaje sigue siendo un LPUSH propio:
+el lote ahorra adquirir la conexión por mensaje y saca la latencia del
+request, pero no reduce el número de round-trips al broker.
+
+Trade-off: los mensajes se pueden perder aunque ya se respondió 202:
+- si el proceso web muere antes del flush (Core no reintentará y la clave de
+  idempotencia de la entrega sigue reservada);
+- si el broker falla durante el flush y tampoco acepta el reintento
+  individual de cada mensaje pendiente. Se registra cada task_id perdido y
+  se libera su clave de idempotencia, para que un reenvío de Core se procese.
+Por eso está desactivado por defecto (SYNC_BATCH_MS=0 publica de inmediato).
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from celery.utils import uuid
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Contador por cola de tareas de sync despachadas y aún no terminadas (incluye
+# las reservadas por un worker y las que esperan un reintento, que ya no
+# están en la lista del broker). Solo se mantiene con SYNC_INLINE_WHEN_IDLE
+IN_FLIGHT_KEY = "{}:in-flight"
+
+# Expiración del contador si una tarea se pierde sin terminar (segundos)
+SYNC_IN_FLIGHT_TTL = 900
+
+_pending = deque()
+_lock = threading.Lock()
+_flusher_pid = None
+
+
+def dispatch(
+    task, args: list, queue: str = None, task_id: str = None, idem_key: str = None
+) -> str:
+    """
+    Encolar una tarea de sync y retornar su task_id.
+
+    Args:
+        task: Tarea Celery (p. ej. sync_customer_task)
+        args: Argumentos posicionales de la tarea
+        queue: Cola destino (None usa la ruta configurada)
+        task_id: task_id ya reservado (None genera uno nuevo)
+        idem_key: Clave de idempotencia reservada para esta entrega; se libera
+            si el mensaje en lote no se llega a publicar
+    """
+    if settings.SYNC_INLINE_WHEN_IDLE:
+        mark_in_flight(queue or task.queue)
+
+    if settings.SYNC_BATCH_MS <= 0:
+        return task.apply_async(args=args, queue=queue, task_id=task_id).id
+
+    task_id = task_id or uuid()
+    _pending.append((task, args, queue, task_id, idem_key))
+    _ensure_flusher()
+    return task_id
+
+
+def mark_in_flight(queue: str) -> None:
+    """Contar una tarea más en curso en la cola (renueva la expiración)."""
+    key = IN_FLIGHT_KEY.format(queue)
+    try:
+        cache.add(key, 0, timeout=SYNC_IN_FLIGHT_TTL)
+        cache.incr(key)
+        cache.touch(key, SYNC_IN_FLIGHT_TTL)
+    except Exception as exc:
+        logger.warning(f"Could not mark sync task in flight for {queue}: {exc}")
+
+
+def finish_in_flight(queue: str) -> None:
+    """Descontar una tarea terminada (éxito o fallo definitivo) de la cola."""
+    key = IN_FLIGHT_KEY.format(queue)
+    try:
+        if cache.decr(key) <= 0:
+            cache.delete(key)
+    except ValueError:
+        pass  # Contador expirado: no hay nada que descontar
+    except Exception as exc:
+        logger.warning(f"Could not finish sync task in flight for {queue}: {exc}")
+
+
+def flush() -> None:
+    """
+    Publicar todos los mensajes pendientes con un solo producer.
+
+    Si el producer compartido falla, los mensajes aún no publicados se
+    reintentan uno a uno con apply_async (con la política de reintentos de
+    conexión de Celery) en lugar de descartar el lote.
+    """
+    if not _pending:
+        return
+
+    batch = []
+    while _pending:
+        batch.append(_pending.popleft())
+
+    published = 0
+    try:
+        with batch[0][0].app.producer_or_acquire() as producer:
+            for task, args, queue, task_id, _ in batch:
+                task.apply_async(
+                    args=args, queue=queue, task_id=task_id, producer=producer
+                )
+                published += 1
+    except Exception as exc:
+        logger.warning(
+            f"Batched publish failed after {published}/{len(batch)} sync tasks, "
+            f"publishing the rest one by one: {exc}"
+        )
+        for message in batch[published:]:
+            _publish_one(*message)
+
+
+def _publish_one(task, args: list, queue: str, task_id: str, idem_key: str) -> None:
+    """
+    Publicar un mensaje con su propia conexión; si se pierde, registrarlo y
+    liberar su clave de idempotencia (el reenvío de Core ya no es duplicado).
+    """
+    try:
+        task.apply_async(args=args, queue=queue, task_id=task_id)
+    except Exception as exc:
+        logger.error(
+            f"Failed to publish batched sync task {task_id}: {exc}",
+            extra={"task_id": task_id, "task_name": task.name},
+        )
+        if idem_key:
+            try:
+                cache.delete(idem_key)
+            except Exception as cache_exc:
+                logger.warning(
+                    f"Could not release idempotency key {idem_key}: {cache_exc}"
+                )
+
+
+def _ensure_flusher() -> None:
+    """Arrancar el hilo de flush una vez por proceso (seguro tras fork)."""
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher_pid == os.getpid():
+            return
+        threading.Thread(
+            target=_flush_loop, name="sync-dispatch-flusher", daemon=True
+        ).start()
+        atexit.register(flush)
+        _flusher_pid = os.getpid()
+
+
+def _flush_loop() -> None:
+    interval = settings.SYNC_BATCH_MS / 1000
+    while True:
+        time.sleep(interval)
+        flush()
@@ -0,0 +1,260 @@
+"""
+JSON Schemas compilados para validar los webhooks de sincronización.
+
+Los serializers de DRF (serializers.py) se mantienen solo para la
+documentación OpenAPI; la validación en los views usa estos validadores,
+compilados una sola vez al importar el módulo con fastjsonschema.
+
+Antes de validar, el payload se normaliza como lo hacían los serializers:
+se descartan las claves que no están en el schema, se recortan los espacios
+de los strings (un campo obligatorio con solo espacios queda vacío y se
+rechaza) y se aceptan enteros y booleanos enviados como string ("3", "true").
+
+Los validadores retornan el payload con los valores por defecto aplicados y
+lanzan JsonSchemaValueException con el primer error encontrado si el payload
+es inválido. Como el payload viene de JSON, solo contiene tipos nativos
+(apto para msgpack en Celery).
+"""
+import re
+
+import fastjsonschema
+from fastjsonschema import JsonSchemaValueException
+
+# Máximo de registros por webhook bulk (se dividen en tareas de SYNC_BULK_BATCH_SIZE)
+SYNC_BULK_MAX_ITEMS = 5000
+
+_SLUG = {"type": "string", "maxLength": 50, "pattern": "^[-a-zA-Z0-9_]+$"}
+_SYNC_MODE = {"type": "string", "enum": ["full", "partial"]}
+_SYNC_VERSION = {"type": "integer"}
+
+
+def _text(max_length: int) -> dict:
+    """String obligatorio no vacío (equivalente a CharField sin allow_blank)."""
+    return {"type": "string", "minLength": 1, "maxLength": max_length}
+
+
+def _optional_text(max_length: int) -> dict:
+    """String que admite null y vacío."""
+    return {"type": ["string", "null"], "maxLength": max_length}
+
+
+CUSTOMER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "customer_id": _text(100),
+        "first_name": _text(255),
+        "last_name": {"type": "string", "maxLength": 255, "default": ""},
+        "email": {
+            "type": ["string", "null"],
+            "anyOf": [{"const": ""}, {"format": "email"}],
+        },
+        "phone": _optional_text(20),
+        "whatsapp": _optional_text(20),
+        "sync_version": _SYNC_VERSION,
+    },
+    "required": ["customer_id", "first_name"],
+}
+
+VEHICLE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "vehicle_id": _text(100),
+        "customer_id": _text(100),
+        "plate": _text(20),
+        "brand": _text(100),
+        "model": _text(100),
+        "year": {"type": ["integer", "null"]},
+        "current_kilometers": {"type": "integer", "default": 0},
+        "last_service_date": {"type": ["string", "null"], "format": "date"},
+        "next_service_kilometers": {"type": ["integer", "null"]},
+        "image_url": {
+            "type": ["string", "null"],
+            "anyOf": [{"const": ""}, {"format": "uri"}],
+        },
+        "sync_version": _SYNC_VERSION,
+    },
+    "required": ["vehicle_id", "customer_id", "plate", "brand", "model"],
+}
+
+GLOBAL_PHASES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sync_mode": {**_SYNC_MODE, "default": "partial"},
+        "phases": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "slug": _SLUG,
+                    "name": _text(100),
+                    "icon": _text(50),
+                    "order": {"type": "integer", "minimum": 1},
+                    "is_active": {"type": "boolean", "default": True},
+                    "description": {"type": ["string", "null"]},
+                },
+                "required": ["slug", "name", "icon", "order"],
+            },
+        },
+        "sync_version": _SYNC_VERSION,
+    },
+    "required": ["phases"],
+}
+
+VEHICLE_PHASES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sync_mode": {**_SYNC_MODE, "default": "full"},
+        "phases": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "phase_slug": _SLUG,
+                    "order": {"type": "integer", "minimum": 1},
+                    "is_active": {"type": "boolean", "default": True},
+                },
+                "required": ["phase_slug", "order"],
+            },
+        },
+        "sync_version": _SYNC_VERSION,
+    },
+    "required": ["phases"],
+}
+
+
+# Mismas reglas de conversión que IntegerField y BooleanField de DRF
+_INTEGER_STRING = re.compile(r"^\s*[-+]?\d+(\.0*)?\s*$")
+_TRUE_VALUES = {"true", "True", "TRUE", "on", "On", "ON", "1", "yes", "y"}
+_FALSE_VALUES = {"false", "False", "FALSE", "off", "Off", "OFF", "0", "no", "n"}
+
+
+def _to_integer(value):
+    if isinstance(value, str) and _INTEGER_STRING.match(value):
+        return int(value.strip().partition(".")[0])
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _to_boolean(value):
+    if isinstance(value, (str, int)) and not isinstance(value, bool):
+        if value in _TRUE_VALUES or value == 1:
+            return True
+        if value in _FALSE_VALUES or value == 0:
+            return False
+    return value
+
+
+def _strip(value):
+    return value.strip() if isinstance(value, str) else value
+
+
+def _keep(value):
+    return value
+
+
+def _normalizer(schema: dict):
+    """
+    Construir (una sola vez) la función que normaliza valores de un schema.
+
+    Los valores que no se pueden convertir se dejan intactos para que el
+    validador reporte el error de tipo.
+    """
+    types = schema.get("type", [])
+    types = [types] if isinstance(types, str) else types
+
+    if "object" in types:
+        fields = {
+            name: _normalizer(field)
+            for name, field in schema.get("properties", {}).items()
+        }
+
+        def normalize_object(value):
+            if not isinstance(value, dict):
+                return value
+            return {
+                name: normalize(value[name])
+                for name, normalize in fields.items()
+                if name in value
+            }
+
+        return normalize_object
+
+    if "array" in types:
+        normalize_item = _normalizer(schema.get("items", {}))
+
+        def normalize_array(value):
+            if not isinstance(value, list):
+                return value
+            return [normalize_item(item) for item in value]
+
+        return normalize_array
+
+    if "integer" in types:
+        return _to_integer
+    if "boolean" in types:
+        return _to_boolean
+    # Los enum (sync_mode) se comparan tal cual, como ChoiceField
+    if "string" in types and "enum" not in schema:
+        return _strip
+    return _keep
+
+
+def _compile(schema: dict):
+    """Compilar el validador de un schema, normalizando el payload antes."""
+    normalize = _normalizer(schema)
+    validator = fastjsonschema.compile(schema)
+
+    def validate(data):
+        return validator(normalize(data))
+
+    return validate
+
+
+def _unique_phase_keys(validator, *keys):
+    """
+    Extender un validador de fases para rechazar slugs u órdenes duplicados.
+
+    JSON Schema no puede expresar unicidad por propiedad (uniqueItems compara
+    objetos completos), así que se verifica tras la validación del schema.
+    """
+    def validate(data):
+        data = validator(data)
+        for key in keys:
+            values = [phase[key] for phase in data["phases"]]
+            if len(values) != len(set(values)):
+                raise JsonSchemaValueException(
+                    f"data.phases must not contain duplicate '{key}' values",
+                    value=values,
+                    name="data.phases",
+                    rule="uniqueItems",
+                )
+        return data
+
+    return validate
+
+
+validate_customer = _compile(CUSTOMER_SCHEMA)
+validate_vehicle = _compile(VEHICLE_SCHEMA)
+validate_customers_bulk = _compile(
+    {
+        "type": "array",
+        "items": CUSTOMER_SCHEMA,
+        "minItems": 1,
+        "maxItems": SYNC_BULK_MAX_ITEMS,
+    }
+)
+validate_vehicles_bulk = _compile(
+    {
+        "type": "array",
+        "items": VEHICLE_SCHEMA,
+        "minItems": 1,
+        "maxItems": SYNC_BULK_MAX_ITEMS,
+    }
+)
+validate_global_phases = _unique_phase_keys(
+    _compile(GLOBAL_PHASES_SCHEMA), "slug", "order"
+)
+validate_vehicle_phases = _unique_phase_keys(
+    _compile(VEHICLE_PHASES_SCHEMA), "phase_slug", "order"
+)
@@ -1,5 +1,8 @@
 """
 Serializers for data synchronization from Core service.
+
+Used to document the webhook payloads in OpenAPI; request validation is done
+by the compiled JSON Schemas in schemas.py.
 """
 from rest_framework import serializers
 
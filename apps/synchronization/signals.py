@@ -0,0 +1,63 @@
+"""
+Django signals for synchronization app.
+"""
+from celery import states
+from celery.signals import task_postrun
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.notifications.models import CustomerContactInfo, Vehicle
+from .dispatch import finish_in_flight
+from .tasks import (
+    CUSTOMER_PAYLOAD_HASH_KEY,
+    VEHICLE_PAYLOAD_HASH_KEY,
+    forget_payload_hashes,
+    sync_customer_task,
+    sync_customers_bulk_task,
+    sync_global_phases_task,
+    sync_vehicle_phases_task,
+    sync_vehicle_task,
+    sync_vehicles_bulk_task,
+)
+
+# Tareas que los webhooks encolan con dispatch() (y cuentan como en curso)
+_DISPATCHED_TASKS = {
+    task.name
+    for task in (
+        sync_customer_task,
+        sync_vehicle_task,
+        sync_customers_bulk_task,
+        sync_vehicles_bulk_task,
+        sync_global_phases_task,
+        sync_vehicle_phases_task,
+    )
+}
+
+
+@receiver([post_save, post_delete], sender=CustomerContactInfo)
+def customer_changed(sender, instance, **kwargs):
+    """Una escritura local invalida el hash del último sync del cliente."""
+    forget_payload_hashes([CUSTOMER_PAYLOAD_HASH_KEY.format(instance.customer_id)])
+
+
+@receiver([post_save, post_delete], sender=Vehicle)
+def vehicle_changed(sender, instance, **kwargs):
+    """Una escritura local invalida el hash del último sync del vehículo."""
+    forget_payload_hashes([VEHICLE_PAYLOAD_HASH_KEY.format(instance.plate)])
+
+
+@task_postrun.connect
+def sync_task_finished(sender=None, state=None, **kwargs):
+    """
+    Descontar la tarea del contador de su cola al terminar.
+
+    Un reintento (RETRY) sigue en curso: se descuenta en su último intento.
+    """
+    if not settings.SYNC_INLINE_WHEN_IDLE or state == states.RETRY:
+        return
+    if sender is None or sender.name not in _DISPATCHED_TASKS:
+        return
+    queue = (sender.request.delivery_info or {}).get("routing_key")
+    if queue:
+        finish_in_flight(queue)
@@ -1,22 +1,165 @@
 """
 Celery tasks for asynchronous data synchronization from Core service.
 """
+import hashlib
+import uuid
+import zlib
+from functools import partial
+
+import orjson
 from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db import InterfaceError, OperationalError, connection, transaction
 from django.utils import timezone
 import logging
 
-from apps.notifications.models import CustomerContactInfo, Vehicle
+from apps.notifications.models import (
+    CustomerContactInfo,
+    ServicePhase,
+    Vehicle,
+    VehiclePhaseConfig,
+)
+from apps.core.exceptions import VehicleNotFoundError
+from .circuit_breaker import db_circuit_breaker
 
 logger = logging.getLogger(__name__)
 
+# Opciones comunes de las tareas de sync.
+# Solo se reintentan errores transitorios de base de datos (caída de conexión,
+# failover); errores de validación o de datos fallan inmediatamente, igual que
+# DatabaseCircuitOpenError (circuit breaker abierto, ver circuit_breaker.py).
+# Celery espera retry_backoff * 2**retries segundos (máx. retry_backoff_max)
+# con jitter completo para no sincronizar reintentos entre workers.
+# Los payloads viajan en msgpack (más compacto que JSON en el broker); por eso
+# deben contener solo tipos nativos (str, int, bool, None, list, dict).
+SYNC_TASK_OPTIONS = {
+    "autoretry_for": (OperationalError, InterfaceError),
+    "retry_backoff": 2,
+    "retry_backoff_max": 600,
+    "retry_jitter": True,
+    "max_retries": 5,
+    "queue": "sync",
+    "serializer": "msgpack",
+    # ACK tras ejecutar: si el worker muere a mitad, la tarea se reentrega.
+    # Seguro porque todas las tareas de sync son idempotentes
+    "acks_late": True,
+}
+
+
+def sync_queue_for(key: str) -> str:
+    """
+    Cola de sync para una entidad (customer_id o placa).
 
-@shared_task(
-    bind=True,
-    max_retries=3,
-    default_retry_delay=60,
-    queue='sync',
+    Con SYNC_SHARDS > 1 las tareas de una misma entidad van siempre a la misma
+    cola "sync.<n>" (crc32 estable entre procesos, a diferencia de hash()).
+    Con un worker de concurrencia 1 por cola, los syncs de una misma fila se
+    procesan en orden y sin competir por sus locks.
+    """
+    shards = settings.SYNC_SHARDS
+    if shards <= 1:
+        return SYNC_TASK_OPTIONS["queue"]
+    return f"sync.{zlib.crc32(key.encode()) % shards}"
+
+
+# Todas las búsquedas y upserts de este módulo dependen de restricciones UNIQUE
+# (índice b-tree implícito en Postgres), que además son el objetivo del
+# ON CONFLICT de bulk_create(update_conflicts=True):
+# - CustomerContactInfo.customer_id (unique=True)
+# - Vehicle.plate (unique=True)
+# - ServicePhase.slug (unique=True)
+# - VehiclePhaseConfig (vehicle, phase) (unique_together)
+# Si alguna se elimina, los upserts fallan y los lookups pasan a seq scan.
+
+# Campos que Core puede actualizar en la proyección local
+CUSTOMER_SYNC_FIELDS = ("first_name", "last_name", "email", "phone", "whatsapp")
+VEHICLE_SYNC_FIELDS = (
+    "customer_id",
+    "brand",
+    "model",
+    "year",
+    "current_kilometers",
+    "image_url",
+    "last_service_date",
+    "next_service_kilometers",
 )
-def sync_customer_task(self, customer_data: dict):
+
+
+def _pick(data: dict, keys) -> dict:
+    """Extraer de data las claves indicadas, omitiendo valores None."""
+    return {k: data[k] for k in keys if data.get(k) is not None}
+
+
+# Tiempo que se recuerda el hash del último payload aplicado (segundos)
+SYNC_PAYLOAD_HASH_TTL = 3600
+
+# Un reenvío sin cambios refresca last_synced_at como mucho con esta
+# frecuencia (segundos); dentro del intervalo no se toca la base de datos
+SYNC_TOUCH_INTERVAL = 300
+
+CUSTOMER_PAYLOAD_HASH_KEY = "synchash:cust:{}"
+VEHICLE_PAYLOAD_HASH_KEY = "synchash:veh:{}"
+
+
+def _payload_hash(fields: dict) -> str:
+    """Hash estable de los campos que se escribirán en la proyección."""
+    return hashlib.sha1(
+        orjson.dumps(fields, option=orjson.OPT_SORT_KEYS, default=str)
+    ).hexdigest()
+
+
+def _skip_unchanged(hash_key: str, payload_hash: str, queryset, sync_ts) -> bool:
+    """
+    Indicar si el payload es idéntico al último aplicado (reenvío de Core).
+
+    Cuesta un GET a Redis por webhook. Un reenvío sin cambios no reescribe la
+    fila: solo refresca last_synced_at (un UPDATE de esa columna) si pasaron
+    más de SYNC_TOUCH_INTERVAL segundos desde la última escritura, así que
+    last_synced_at tiene esa resolución. Si el UPDATE no encuentra la fila
+    (borrada por otra vía) se hace el upsert completo. Si Redis no está
+    disponible se asume que cambió y se escribe (fail-open).
+    """
+    try:
+        remembered = cache.get(hash_key)
+    except Exception as exc:
+        logger.warning(f"Payload hash unavailable for {hash_key}: {exc}")
+        return False
+    if not isinstance(remembered, tuple) or remembered[0] != payload_hash:
+        return False
+
+    if sync_ts.timestamp() - remembered[1] < SYNC_TOUCH_INTERVAL:
+        return True
+    if queryset.update(last_synced_at=sync_ts) == 0:
+        return False
+    _remember_payload(hash_key, payload_hash, sync_ts)
+    return True
+
+
+def _remember_payload(hash_key: str, payload_hash: str, sync_ts) -> None:
+    """Guardar el hash del payload recién aplicado y cuándo se escribió."""
+    try:
+        cache.set(
+            hash_key, (payload_hash, sync_ts.timestamp()), timeout=SYNC_PAYLOAD_HASH_TTL
+        )
+    except Exception as exc:
+        logger.warning(f"Could not store payload hash for {hash_key}: {exc}")
+
+
+def forget_payload_hashes(hash_keys: list) -> None:
+    """
+    Olvidar los hashes de registros escritos por otra vía (bulk, API, admin).
+
+    Sin esto, un reenvío igual al último payload individual se descartaría
+    aunque la fila ya tenga otros datos.
+    """
+    try:
+        cache.delete_many(hash_keys)
+    except Exception as exc:
+        logger.warning(f"Could not forget payload hashes: {exc}")
+
+
+@db_circuit_breaker()
+def sync_customer(customer_data: dict) -> dict:
     """
     Sincroniza datos de cliente desde Core a la base local.
 
@@ -38,64 +181,72 @@ def sync_customer_task(self, customer_data: dict):
             }
 
     Returns:
-        dict: {"status": "success", "customer_id": str, "action": "created|updated"}
+        dict: {"status": "success", "customer_id": str, "action": "upserted" | "noop"}
 
     Raises:
-        Exception: Si falla después de todos los retries
+        OperationalError: Si la base de datos no está disponible
+        DatabaseCircuitOpenError: Si el circuit breaker de BD está abierto
     """
     customer_id = customer_data.get("customer_id")
 
-    try:
-        # Preparar datos para update_or_create
-        defaults = {
-            "first_name": customer_data.get("first_name"),
-            "last_name": customer_data.get("last_name", ""),
-            "email": customer_data.get("email"),
-            "phone": customer_data.get("phone"),
-            "whatsapp": customer_data.get("whatsapp"),
+    # Datos para el upsert, sin None para evitar sobrescribir con null
+    defaults = _pick(customer_data, CUSTOMER_SYNC_FIELDS)
+
+    if customer_data.get("sync_version"):
+        defaults["sync_version"] = customer_data["sync_version"]
+
+    # Reenvío idéntico al último aplicado: no reescribir la fila
+    sync_ts = timezone.now()
+    hash_key = CUSTOMER_PAYLOAD_HASH_KEY.format(customer_id)
+    payload_hash = _payload_hash(defaults)
+    if _skip_unchanged(
+        hash_key,
+        payload_hash,
+        CustomerContactInfo.objects.filter(customer_id=customer_id),
+        sync_ts,
+    ):
+        return {
+            "status": "success",
+            "customer_id": customer_id,
+            "action": "noop",
         }
 
-        # Limpiar valores None/vacíos para evitar sobrescribir con null
-        defaults = {k: v for k, v in defaults.items() if v is not None}
+    # Agregar tracking de sincronización
+    defaults["last_synced_at"] = sync_ts
 
-        # Agregar tracking de sincronización
-        defaults["last_synced_at"] = timezone.now()
-        if customer_data.get("sync_version"):
-            defaults["sync_version"] = customer_data.get("sync_version")
+    # Upsert nativo: INSERT ... ON CONFLICT (customer_id) DO UPDATE
+    # (una sola sentencia, sin SELECT ... FOR UPDATE ni savepoint)
+    CustomerContactInfo.objects.bulk_create(
+        [CustomerContactInfo(customer_id=customer_id, **defaults)],
+        update_conflicts=True,
+        unique_fields=["customer_id"],
+        update_fields=[*defaults.keys(), "updated_at"],
+    )
 
-        customer, created = CustomerContactInfo.objects.update_or_create(
-            customer_id=customer_id, defaults=defaults
-        )
+    _remember_payload(hash_key, payload_hash, sync_ts)
 
-        action = "created" if created else "updated"
-        logger.info(
-            f"Customer {customer_id} {action} successfully",
-            extra={"customer_id": customer_id, "action": action},
-        )
+    logger.info(
+        f"Customer {customer_id} upserted successfully",
+        extra={"customer_id": customer_id, "action": "upserted"},
+    )
 
-        return {
-            "status": "success",
-            "customer_id": customer_id,
-            "action": action,
-        }
+    return {
+        "status": "success",
+        "customer_id": customer_id,
+        "action": "upserted",
+    }
 
-    except Exception as exc:
-        logger.error(
-            f"Error syncing customer {customer_id}: {exc}",
-            extra={"customer_id": customer_id, "error": str(exc)},
-            exc_info=True,
-        )
-        # Retry con backoff exponencial
-        raise self.retry(exc=exc)
 
+@shared_task(**SYNC_TASK_OPTIONS)
+def sync_customer_task(customer_data: dict):
+    """
+    Tarea Celery para sync_customer (reintenta errores transitorios de BD).
+    """
+    return sync_customer(customer_data)
 
-@shared_task(
-    bind=True,
-    max_retries=3,
-    default_retry_delay=60,
-    queue='sync',
-)
-def sync_vehicle_task(self, vehicle_data: dict):
+
+@db_circuit_breaker()
+def sync_vehicle(vehicle_data: dict) -> dict:
     """
     Sincroniza datos de vehículo desde Core a la base local.
 
@@ -121,95 +272,339 @@ def sync_vehicle_task(self, vehicle_data: dict):
             }
 
     Returns:
-        dict: {"status": "success", "plate": str, "action": "created|updated"}
+        dict: {"status": "success", "plate": str, "action": "upserted" | "noop"}
 
     Raises:
-        Exception: Si falla después de todos los retries
+        OperationalError: Si la base de datos no está disponible
+        DatabaseCircuitOpenError: Si el circuit breaker de BD está abierto
     """
     plate = vehicle_data.get("plate")
     customer_id = vehicle_data.get("customer_id")
 
-    try:
-        # Verificar que el cliente existe localmente
-        # Si no existe, loggear advertencia pero continuar
-        # (El cliente debería sincronizarse primero, pero no fallar)
-        customer_exists = CustomerContactInfo.objects.filter(
-            customer_id=customer_id
-        ).exists()
-
-        if not customer_exists:
-            logger.warning(
-                f"Vehicle {plate} references non-existent customer {customer_id}. "
-                "Customer should be synced first.",
-                extra={"plate": plate, "customer_id": customer_id},
-            )
+    # No se verifica que el cliente exista: los vehículos huérfanos se
+    # reportan en lote una vez al día (report_orphan_vehicles_task)
+
+    # Datos para el upsert, sin None: se respetan los valores locales
+    # (p. ej. last_service_date) de los campos que no vienen en el payload
+    defaults = _pick(vehicle_data, VEHICLE_SYNC_FIELDS)
+
+    if vehicle_data.get("sync_version"):
+        defaults["sync_version"] = vehicle_data["sync_version"]
 
-        # Preparar datos para update_or_create
-        defaults = {
+    # Reenvío idéntico al último aplicado: no reescribir la fila
+    sync_ts = timezone.now()
+    hash_key = VEHICLE_PAYLOAD_HASH_KEY.format(plate)
+    payload_hash = _payload_hash(defaults)
+    if _skip_unchanged(
+        hash_key, payload_hash, Vehicle.objects.filter(plate=plate), sync_ts
+    ):
+        return {
+            "status": "success",
+            "plate": plate,
             "customer_id": customer_id,
-            "brand": vehicle_data.get("brand"),
-            "model": vehicle_data.get("model"),
-            "year": vehicle_data.get("year"),
-            "current_kilometers": vehicle_data.get("current_kilometers", 0),
-            "image_url": vehicle_data.get("image_url"),
+            "action": "noop",
         }
 
-        # Solo actualizar last_service_date si viene en payload
-        if vehicle_data.get("last_service_date"):
-            defaults["last_service_date"] = vehicle_data.get("last_service_date")
+    # Agregar tracking de sincronización
+    defaults["last_synced_at"] = sync_ts
 
-        # Solo actualizar next_service_kilometers si viene en payload
-        if vehicle_data.get("next_service_kilometers"):
-            defaults["next_service_kilometers"] = vehicle_data.get(
-                "next_service_kilometers"
-            )
+    # Upsert nativo: INSERT ... ON CONFLICT (plate) DO UPDATE
+    # (placa como identificador único)
+    Vehicle.objects.bulk_create(
+        [Vehicle(plate=plate, **defaults)],
+        update_conflicts=True,
+        unique_fields=["plate"],
+        update_fields=[*defaults.keys(), "updated_at"],
+    )
+
+    _remember_payload(hash_key, payload_hash, sync_ts)
 
-        # Limpiar valores None
-        defaults = {k: v for k, v in defaults.items() if v is not None}
+    logger.info(
+        f"Vehicle {plate} upserted successfully",
+        extra={"plate": plate, "customer_id": customer_id, "action": "upserted"},
+    )
 
-        # Agregar tracking de sincronización
-        defaults["last_synced_at"] = timezone.now()
-        if vehicle_data.get("sync_version"):
-            defaults["sync_version"] = vehicle_data.get("sync_version")
+    return {
+        "status": "success",
+        "plate": plate,
+        "customer_id": customer_id,
+        "action": "upserted",
+    }
 
-        vehicle, created = Vehicle.objects.update_or_create(
-            plate=plate,  # Usar placa como identificador único
-            defaults=defaults,
+
+@shared_task(**SYNC_TASK_OPTIONS)
+def sync_vehicle_task(vehicle_data: dict):
+    """
+    Tarea Celery para sync_vehicle (reintenta errores transitorios de BD).
+    """
+    return sync_vehicle(vehicle_data)
+
+
+# Solo la ejecuta Beat y nadie consulta su task_id: el conteo ya queda en el log
+@shared_task(queue='maintenance', ignore_result=True)
+def report_orphan_vehicles_task():
+    """
+    Reporta vehículos cuyo customer_id no existe en CustomerContactInfo.
+
+    Reemplaza la verificación por vehículo que hacía sync_vehicle_task
+    (un SELECT extra por webhook) con una sola consulta agregada diaria.
+    Runs daily via Celery Beat (configured in config/celery.py).
+
+    Returns:
+        dict: {"orphan_vehicles": int}
+    """
+    orphans = Vehicle.objects.exclude(
+        customer_id__in=CustomerContactInfo.objects.values("customer_id")
+    )
+    orphan_count = orphans.count()
+
+    if orphan_count:
+        sample_plates = list(orphans.values_list("plate", flat=True)[:20])
+        logger.warning(
+            f"{orphan_count} vehicles reference non-existent customers. "
+            f"Customers should be synced first. Sample plates: {sample_plates}",
+            extra={"orphan_vehicles": orphan_count},
         )
 
-        action = "created" if created else "updated"
-        logger.info(
-            f"Vehicle {plate} {action} successfully",
-            extra={"plate": plate, "customer_id": customer_id, "action": action},
+    return {"orphan_vehicles": orphan_count}
+
+
+# ============================================================================
+# Bulk Synchronization Tasks
+# ============================================================================
+
+# Tamaño de lote para bulk_create/bulk_update y para dividir payloads en tareas
+SYNC_BULK_BATCH_SIZE = 500
+
+
+@shared_task(**SYNC_TASK_OPTIONS)
+@db_circuit_breaker()
+def sync_customers_bulk_task(customer_list: list):
+    """
+    Sincroniza un lote de clientes desde Core en una sola transacción.
+
+    Misma semántica que sync_customer_task (IDEMPOTENTE, no sobrescribe con
+    null), pero con un SELECT de existentes, un bulk_create para los nuevos
+    y un bulk_update para los existentes, en lugar de un update_or_create
+    por registro.
+
+    Args:
+        customer_list: Lista de dicts con el mismo formato que sync_customer_task
+
+    Returns:
+        dict: {"status": "success", "created": int, "updated": int}
+    """
+    sync_ts = timezone.now()
+    # Deduplicar por customer_id (el último payload gana)
+    incoming = {c["customer_id"]: c for c in customer_list}
+
+    with transaction.atomic():
+        existing = {
+            c.customer_id: c
+            for c in CustomerContactInfo.objects.filter(
+                customer_id__in=incoming.keys()
+            ).only("id", "customer_id", *CUSTOMER_SYNC_FIELDS)
+        }
+
+        to_create = []
+        to_update = []
+        for customer_id, customer_data in incoming.items():
+            customer = existing.get(customer_id)
+            if customer is None:
+                customer = CustomerContactInfo(customer_id=customer_id)
+                to_create.append(customer)
+            else:
+                to_update.append(customer)
+
+            for field, value in _pick(customer_data, CUSTOMER_SYNC_FIELDS).items():
+                setattr(customer, field, value)
+
+            customer.last_synced_at = sync_ts
+            customer.updated_at = sync_ts
+            if customer_data.get("sync_version"):
+                customer.sync_version = customer_data["sync_version"]
+
+        CustomerContactInfo.objects.bulk_create(
+            to_create, batch_size=SYNC_BULK_BATCH_SIZE
+        )
+        CustomerContactInfo.objects.bulk_update(
+            to_update,
+            fields=[
+                *CUSTOMER_SYNC_FIELDS,
+                "last_synced_at",
+                "sync_version",
+                "updated_at",
+            ],
+            batch_size=SYNC_BULK_BATCH_SIZE,
         )
 
-        return {
-            "status": "success",
-            "plate": plate,
-            "customer_id": customer_id,
-            "action": action,
+    forget_payload_hashes(
+        [CUSTOMER_PAYLOAD_HASH_KEY.format(customer_id) for customer_id in incoming]
+    )
+
+    logger.info(
+        f"Bulk customer sync completed: "
+        f"created={len(to_create)}, updated={len(to_update)}"
+    )
+
+    return {
+        "status": "success",
+        "created": len(to_create),
+        "updated": len(to_update),
+    }
+
+
+@shared_task(**SYNC_TASK_OPTIONS)
+@db_circuit_breaker()
+def sync_vehicles_bulk_task(vehicle_list: list):
+    """
+    Sincroniza un lote de vehículos desde Core en una sola transacción.
+
+    Misma semántica que sync_vehicle_task (IDEMPOTENTE por placa, no
+    sobrescribe con null), usando bulk_create + bulk_update.
+
+    Args:
+        vehicle_list: Lista de dicts con el mismo formato que sync_vehicle_task
+
+    Returns:
+        dict: {"status": "success", "created": int, "updated": int}
+    """
+    sync_ts = timezone.now()
+    # Deduplicar por placa (el último payload gana)
+    incoming = {v["plate"]: v for v in vehicle_list}
+
+    with transaction.atomic():
+        existing = {
+            v.plate: v
+            for v in Vehicle.objects.filter(
+                plate__in=incoming.keys()
+            ).only("id", "plate", *VEHICLE_SYNC_FIELDS)
         }
 
-    except Exception as exc:
-        logger.error(
-            f"Error syncing vehicle {plate}: {exc}",
-            extra={"plate": plate, "error": str(exc)},
-            exc_info=True,
+        to_create = []
+        to_update = []
+        for plate, vehicle_data in incoming.items():
+            vehicle = existing.get(plate)
+            if vehicle is None:
+                vehicle = Vehicle(plate=plate)
+                to_create.append(vehicle)
+            else:
+                to_update.append(vehicle)
+
+            for field, value in _pick(vehicle_data, VEHICLE_SYNC_FIELDS).items():
+                setattr(vehicle, field, value)
+
+            vehicle.last_synced_at = sync_ts
+            vehicle.updated_at = sync_ts
+            if vehicle_data.get("sync_version"):
+                vehicle.sync_version = vehicle_data["sync_version"]
+
+        Vehicle.objects.bulk_create(to_create, batch_size=SYNC_BULK_BATCH_SIZE)
+        Vehicle.objects.bulk_update(
+            to_update,
+            fields=[
+                *VEHICLE_SYNC_FIELDS,
+                "last_synced_at",
+                "sync_version",
+                "updated_at",
+            ],
+            batch_size=SYNC_BULK_BATCH_SIZE,
         )
-        raise self.retry(exc=exc)
+
+    forget_payload_hashes([VEHICLE_PAYLOAD_HASH_KEY.format(plate) for plate in incoming])
+
+    logger.info(
+        f"Bulk vehicle sync completed: "
+        f"created={len(to_create)}, updated={len(to_update)}"
+    )
+
+    return {
+        "status": "success",
+        "created": len(to_create),
+        "updated": len(to_update),
+    }
 
 
 # ============================================================================
 # Phase Synchronization Tasks
 # ============================================================================
 
-@shared_task(
-    bind=True,
-    max_retries=3,
-    default_retry_delay=60,
-    queue='sync',
+# A partir de este número de fases el upsert global usa COPY (solo PostgreSQL)
+SYNC_PHASES_COPY_THRESHOLD = 2000
+
+GLOBAL_PHASE_COPY_FIELDS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "slug",
+    "name",
+    "icon",
+    "order",
+    "is_active",
+    "description",
 )
-def sync_global_phases_task(self, sync_data: dict):
+
+
+def _copy_upsert_global_phases(phases_data: list) -> None:
+    """
+    Upsert de fases globales vía COPY a una tabla temporal + INSERT ... SELECT.
+
+    Para lotes muy grandes COPY es varias veces más rápido que un INSERT
+    parametrizado. Debe ejecutarse dentro de transaction.atomic(): la tabla
+    temporal se elimina en el COMMIT (ON COMMIT DROP). Requiere psycopg 3.
+    """
+    qn = connection.ops.quote_name
+    table = qn(ServicePhase._meta.db_table)
+    columns = [
+        qn(ServicePhase._meta.get_field(field).column)
+        for field in GLOBAL_PHASE_COPY_FIELDS
+    ]
+    column_list = ", ".join(columns)
+    update_list = ", ".join(
+        f"{column} = EXCLUDED.{column}"
+        for field, column in zip(GLOBAL_PHASE_COPY_FIELDS, columns)
+        if field not in ("id", "created_at", "slug")
+    )
+
+    now = timezone.now()
+    # Deduplicar por slug (el último gana): ON CONFLICT no admite que una
+    # misma sentencia actualice dos veces la misma fila
+    rows = {
+        phase_data["slug"]: (
+            uuid.uuid4(),
+            now,
+            now,
+            phase_data["slug"],
+            phase_data["name"],
+            phase_data["icon"],
+            phase_data["order"],
+            phase_data.get("is_active", True),
+            phase_data.get("description"),
+        )
+        for phase_data in phases_data
+    }
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMP TABLE tmp_service_phases "
+            f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        with cursor.cursor.copy(
+            f"COPY tmp_service_phases ({column_list}) FROM STDIN"
+        ) as copy:
+            for row in rows.values():
+                copy.write_row(row)
+        cursor.execute(
+            f"INSERT INTO {table} ({column_list}) "
+            f"SELECT {column_list} FROM tmp_service_phases "
+            f"ON CONFLICT ({qn(ServicePhase._meta.get_field('slug').column)}) "
+            f"DO UPDATE SET {update_list}"
+        )
+
+
+@shared_task(**SYNC_TASK_OPTIONS)
+@db_circuit_breaker()
+def sync_global_phases_task(sync_data: dict):
     """
     Sincroniza fases globales desde Core.
 
@@ -236,83 +631,95 @@ def sync_global_phases_task(self, sync_data: dict):
     Returns:
         dict: {"status": "success", "created": int, "updated": int, "deleted": int}
     """
-    from django.db import transaction
-    from apps.notifications.models import ServicePhase
-
     sync_mode = sync_data.get("sync_mode", "partial")
     phases_data = sync_data.get("phases", [])
 
-    created_count = 0
-    updated_count = 0
     deleted_count = 0
 
-    try:
-        with transaction.atomic():
-            # Obtener slugs que deben existir después del sync
-            incoming_slugs = {p["slug"] for p in phases_data}
-
-            # Actualizar o crear fases
-            for phase_data in phases_data:
-                defaults = {
-                    "name": phase_data["name"],
-                    "icon": phase_data["icon"],
-                    "order": phase_data["order"],
-                    "is_active": phase_data.get("is_active", True),
-                    "description": phase_data.get("description"),
-                }
-
-                phase, created = ServicePhase.objects.update_or_create(
-                    slug=phase_data["slug"],
-                    defaults=defaults,
-                )
-
-                if created:
-                    created_count += 1
-                    logger.info(f"Created phase: {phase.slug}")
-                else:
-                    updated_count += 1
-                    logger.info(f"Updated phase: {phase.slug}")
-
-            # En modo "full", eliminar fases no en lista
-            if sync_mode == "full":
-                phases_to_delete = ServicePhase.objects.exclude(
-                    slug__in=incoming_slugs
-                )
-                deleted_count = phases_to_delete.count()
-
-                if deleted_count > 0:
-                    deleted_slugs = list(phases_to_delete.values_list('slug', flat=True))
-                    logger.warning(
-                        f"Full sync: Deleting {deleted_count} phases not in sync: {deleted_slugs}. "
-                        f"Associated PhaseChannelConfigs will be CASCADE DELETED."
+    with transaction.atomic():
+        # Obtener slugs que deben existir después del sync
+        incoming_slugs = {p["slug"] for p in phases_data}
+
+        # Slugs ya existentes (para reportar created/updated y, en modo
+        # "full", listar las fases que se eliminan)
+        current_phases = ServicePhase.objects.all()
+        if sync_mode != "full":
+            current_phases = current_phases.filter(slug__in=incoming_slugs)
+        current_slugs = set(current_phases.values_list("slug", flat=True))
+        existing_slugs = current_slugs & incoming_slugs
+
+        if (
+            connection.vendor == "postgresql"
+            and len(phases_data) > SYNC_PHASES_COPY_THRESHOLD
+        ):
+            _copy_upsert_global_phases(phases_data)
+        else:
+            # Actualizar o crear todas las fases en una sola sentencia
+            # INSERT ... ON CONFLICT (slug) DO UPDATE
+            ServicePhase.objects.bulk_create(
+                [
+                    ServicePhase(
+                        slug=phase_data["slug"],
+                        name=phase_data["name"],
+                        icon=phase_data["icon"],
+                        order=phase_data["order"],
+                        is_active=phase_data.get("is_active", True),
+                        description=phase_data.get("description"),
                     )
-                    phases_to_delete.delete()
+                    for phase_data in phases_data
+                ],
+                update_conflicts=True,
+                unique_fields=["slug"],
+                update_fields=[
+                    "name",
+                    "icon",
+                    "order",
+                    "is_active",
+                    "description",
+                    "updated_at",
+                ],
+            )
 
-        logger.info(
-            f"Global phases sync completed: "
-            f"created={created_count}, updated={updated_count}, deleted={deleted_count}"
-        )
+        updated_count = len(existing_slugs)
+        created_count = len(incoming_slugs) - updated_count
+
+        # En modo "full", eliminar fases no en lista
+        if sync_mode == "full":
+            _, deleted_per_model = ServicePhase.objects.exclude(
+                slug__in=incoming_slugs
+            ).delete()
+            deleted_count = deleted_per_model.get(ServicePhase._meta.label, 0)
+
+            # Efectos secundarios (logs, y en el futuro eventos o invalidación
+            # de caché) se ejecutan tras el COMMIT para no alargar los locks
+            if deleted_count > 0:
+                deleted_slugs = sorted(current_slugs - incoming_slugs)
+                transaction.on_commit(
+                    partial(
+                        logger.warning,
+                        f"Full sync: Deleted {deleted_count} phases not in sync: "
+                        f"{deleted_slugs}. "
+                        f"Associated PhaseChannelConfigs were CASCADE DELETED.",
+                    )
+                )
 
-        return {
-            "status": "success",
-            "sync_mode": sync_mode,
-            "created": created_count,
-            "updated": updated_count,
-            "deleted": deleted_count,
-        }
+    logger.info(
+        f"Global phases sync completed: "
+        f"created={created_count}, updated={updated_count}, deleted={deleted_count}"
+    )
 
-    except Exception as exc:
-        logger.error(f"Error syncing global phases: {exc}", exc_info=True)
-        raise self.retry(exc=exc)
+    return {
+        "status": "success",
+        "sync_mode": sync_mode,
+        "created": created_count,
+        "updated": updated_count,
+        "deleted": deleted_count,
+    }
 
 
-@shared_task(
-    bind=True,
-    max_retries=3,
-    default_retry_delay=60,
-    queue='sync',
-)
-def sync_vehicle_phases_task(self, sync_data: dict):
+@shared_task(**SYNC_TASK_OPTIONS)
+@db_circuit_breaker()
+def sync_vehicle_phases_task(sync_data: dict):
     """
     Sincroniza configuración de fases para un vehículo específico.
 
@@ -337,84 +744,101 @@ def sync_vehicle_phases_task(self, sync_data: dict):
 
     Returns:
         dict: {"status": "success", "plate": str, "created": int, "updated": int, "deleted": int}
-    """
-    from django.db import transaction
-    from apps.notifications.models import Vehicle, ServicePhase, VehiclePhaseConfig
 
+    Raises:
+        VehicleNotFoundError: Si la placa no existe (la tarea queda en FAILURE)
+        ServicePhase.DoesNotExist: Si algún phase_slug no existe
+    """
     plate = sync_data.get("plate")
     sync_mode = sync_data.get("sync_mode", "full")
     phases_data = sync_data.get("phases", [])
     sync_version = sync_data.get("sync_version")
+    # Un único timestamp para todas las configs del lote
+    sync_ts = timezone.now()
 
-    created_count = 0
-    updated_count = 0
     deleted_count = 0
 
-    try:
-        vehicle = Vehicle.objects.get(plate=plate)
-
-        with transaction.atomic():
-            incoming_phase_slugs = {p["phase_slug"] for p in phases_data}
-
-            # Actualizar o crear configuraciones de fase por vehículo
-            for phase_data in phases_data:
-                phase = ServicePhase.objects.get(slug=phase_data["phase_slug"])
-
-                defaults = {
-                    "order": phase_data["order"],
-                    "is_active": phase_data.get("is_active", True),
-                    "last_synced_at": timezone.now(),
-                }
-
-                if sync_version:
-                    defaults["sync_version"] = sync_version
-
-                config, created = VehiclePhaseConfig.objects.update_or_create(
-                    vehicle=vehicle,
-                    phase=phase,
-                    defaults=defaults,
-                )
+    with transaction.atomic():
+        # Bloquear la fila del vehículo: dos syncs del mismo vehículo no se
+        # intercalan. Con nowait, si otro worker ya tiene el lock se lanza
+        # OperationalError de inmediato y la tarea se reintenta con backoff
+        # (autoretry_for), en lugar de bloquear este worker esperando el lock.
+        # El circuit breaker no cuenta este error como caída de la BD
+        try:
+            vehicle = (
+                Vehicle.objects.select_for_update(nowait=True)
+                .only("id")
+                .get(plate=plate)
+            )
+        except Vehicle.DoesNotExist:
+            raise VehicleNotFoundError(f"Vehicle not found for phases sync: {plate}")
 
-                if created:
-                    created_count += 1
-                else:
-                    updated_count += 1
-
-            # En modo "full", eliminar configs no en lista
-            if sync_mode == "full":
-                configs_to_delete = VehiclePhaseConfig.objects.filter(
-                    vehicle=vehicle
-                ).exclude(
-                    phase__slug__in=incoming_phase_slugs
-                )
-                deleted_count = configs_to_delete.count()
-                configs_to_delete.delete()
+        incoming_phase_slugs = {p["phase_slug"] for p in phases_data}
 
-        logger.info(
-            f"Vehicle phases sync for {plate}: "
-            f"created={created_count}, updated={updated_count}, deleted={deleted_count}"
+        # Resolver todas las fases en una sola consulta (en lugar de un get por fase)
+        phases_by_slug = ServicePhase.objects.in_bulk(
+            incoming_phase_slugs, field_name="slug"
         )
+        missing_slugs = incoming_phase_slugs - phases_by_slug.keys()
+        if missing_slugs:
+            raise ServicePhase.DoesNotExist(
+                f"ServicePhase not found: {sorted(missing_slugs)}"
+            )
 
-        return {
-            "status": "success",
-            "plate": plate,
-            "created": created_count,
-            "updated": updated_count,
-            "deleted": deleted_count,
-        }
-
-    except Vehicle.DoesNotExist:
-        logger.error(f"Vehicle not found for phases sync: {plate}")
-        return {
-            "status": "error",
-            "plate": plate,
-            "error": "Vehicle not found",
-        }
+        # Configs existentes (solo para reportar created/updated)
+        existing_phase_ids = set(
+            VehiclePhaseConfig.objects.filter(
+                vehicle=vehicle,
+                phase__in=phases_by_slug.values(),
+            ).values_list("phase_id", flat=True)
+        )
 
-    except ServicePhase.DoesNotExist as exc:
-        logger.error(f"ServicePhase not found during vehicle phases sync: {exc}")
-        raise self.retry(exc=exc)
+        configs = [
+            VehiclePhaseConfig(
+                vehicle=vehicle,
+                phase=phases_by_slug[phase_data["phase_slug"]],
+                order=phase_data["order"],
+                is_active=phase_data.get("is_active", True),
+                last_synced_at=sync_ts,
+                sync_version=sync_version or None,
+            )
+            for phase_data in phases_data
+        ]
+
+        update_fields = ["order", "is_active", "last_synced_at", "updated_at"]
+        if sync_version:
+            update_fields.append("sync_version")
+
+        # Actualizar o crear configuraciones de fase por vehículo en una sola
+        # sentencia INSERT ... ON CONFLICT (vehicle_id, phase_id) DO UPDATE
+        VehiclePhaseConfig.objects.bulk_create(
+            configs,
+            update_conflicts=True,
+            unique_fields=["vehicle", "phase"],
+            update_fields=update_fields,
+        )
 
-    except Exception as exc:
-        logger.error(f"Error syncing vehicle phases for {plate}: {exc}", exc_info=True)
-        raise self.retry(exc=exc)
+        updated_count = len(existing_phase_ids)
+        created_count = len(configs) - updated_count
+
+        # En modo "full", eliminar configs no en lista
+        if sync_mode == "full":
+            _, deleted_per_model = VehiclePhaseConfig.objects.filter(
+                vehicle=vehicle
+            ).exclude(
+                phase__slug__in=incoming_phase_slugs
+            ).delete()
+            deleted_count = deleted_per_model.get(VehiclePhaseConfig._meta.label, 0)
+
+    logger.info(
+        f"Vehicle phases sync for {plate}: "
+        f"created={created_count}, updated={updated_count}, deleted={deleted_count}"
+    )
+
+    return {
+        "status": "success",
+        "plate": plate,
+        "created": created_count,
+        "updated": updated_count,
+        "deleted": deleted_count,
+    }
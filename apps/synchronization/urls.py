@@ -5,9 +5,12 @@ from django.urls import path
 from .views import (
     SyncCustomerView,
     SyncVehicleView,
+    SyncCustomersBulkView,
+    SyncVehiclesBulkView,
     SyncGlobalPhasesView,
     SyncVehiclePhasesView,
     TaskStatusView,
+    TaskStatusBulkView,
 )
 
 app_name = "synchronization"
@@ -17,6 +20,18 @@ urlpatterns = [
     path("customers/sync/", SyncCustomerView.as_view(), name="sync-customer"),
     path("vehicles/sync/", SyncVehicleView.as_view(), name="sync-vehicle"),
 
+    # Bulk customer and vehicle sync
+    path(
+        "customers/sync/bulk/",
+        SyncCustomersBulkView.as_view(),
+        name="sync-customers-bulk"
+    ),
+    path(
+        "vehicles/sync/bulk/",
+        SyncVehiclesBulkView.as_view(),
+        name="sync-vehicles-bulk"
+    ),
+
     # Phase sync
     path("phases/sync/", SyncGlobalPhasesView.as_view(), name="sync-global-phases"),
     path(
@@ -26,5 +41,6 @@ urlpatterns = [
     ),
 
     # Task status
+    path("tasks/status/", TaskStatusBulkView.as_view(), name="task-status-bulk"),
     path("tasks/<str:task_id>/status/", TaskStatusView.as_view(), name="task-status"),
 ]
@@ -1,28 +1,454 @@
 """
 Views for internal API endpoints (service-to-service synchronization).
 """
+import hashlib
+import json
+import logging
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import InterfaceError, OperationalError
+from django.http import HttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    OpenApiExample,
+    OpenApiParameter,
+    OpenApiResponse,
+    extend_schema,
+)
+from celery import states
+from celery.backends.base import KeyValueStoreBackend
 from celery.result import AsyncResult
+from celery.utils import uuid
 
 from apps.core.authentication import InternalServiceAuthentication
+from apps.core.parsers import ORJSONParser
+from apps.core.renderers import ORJSONRenderer
+from .circuit_breaker import DB_BREAKER_RECOVERY_TIMEOUT, db_circuit_is_open
 from .serializers import (
     CustomerSyncSerializer,
     VehicleSyncSerializer,
     GlobalPhaseSyncSerializer,
     VehiclePhaseSyncSerializer,
 )
+from .dispatch import IN_FLIGHT_KEY, dispatch
+from .schemas import (
+    SYNC_BULK_MAX_ITEMS,
+    JsonSchemaValueException,
+    validate_customer,
+    validate_vehicle,
+    validate_customers_bulk,
+    validate_vehicles_bulk,
+    validate_global_phases,
+    validate_vehicle_phases,
+)
 from .tasks import (
+    SYNC_BULK_BATCH_SIZE,
+    sync_customer,
+    sync_vehicle,
+    sync_queue_for,
     sync_customer_task,
     sync_vehicle_task,
+    sync_customers_bulk_task,
+    sync_vehicles_bulk_task,
     sync_global_phases_task,
     sync_vehicle_phases_task,
 )
 
+logger = logging.getLogger(__name__)
+
+# Ventana durante la cual un reintento del mismo webhook se descarta (segundos)
+SYNC_IDEMPOTENCY_TTL = 600
+
+# Cuánto tiempo se recuerda que una cola tiene backlog (segundos)
+SYNC_QUEUE_BUSY_TTL = 5
+
+# Máximo de task_ids por consulta de estado en lote
+TASK_STATUS_BULK_MAX = 100
+
+# Parte fija de las respuestas 202, serializada una sola vez al importar
+_CUSTOMER_ACCEPTED_PREFIX = b'{"status":"accepted","message":"Customer sync queued"'
+_VEHICLE_ACCEPTED_PREFIX = b'{"status":"accepted","message":"Vehicle sync queued"'
+
+
+# ============================================================================
+# OpenAPI responses (construidas una sola vez al importar el módulo)
+# ============================================================================
+
+def _response(description: str, example=None) -> OpenApiResponse:
+    """Respuesta OpenAPI (objeto JSON) con un ejemplo opcional."""
+    if example is None:
+        return OpenApiResponse(description=description)
+    return OpenApiResponse(
+        response=OpenApiTypes.OBJECT,
+        description=description,
+        examples=[OpenApiExample("Response", value=example)],
+    )
+
+
+_BAD_REQUEST_400 = _response(
+    "Invalid payload. Only the first validation error is reported, as "
+    "{field: [message]}; unknown keys are ignored",
+    {"first_name": ["data.first_name must be longer than or equal to 1 characters"]},
+)
+
+_UNAUTHORIZED_401 = _response(
+    "Invalid API key", {"detail": "Invalid internal API key"}
+)
+
+_SERVICE_UNAVAILABLE_503 = _response(
+    "Database circuit breaker open; retry after Retry-After seconds",
+    {"detail": "Database unavailable, retry later"},
+)
+
+_CUSTOMER_SYNC_RESPONSES = {
+    200: _response(
+        "Synced inline (sync queue idle, SYNC_INLINE_WHEN_IDLE)",
+        {"status": "success", "customer_id": "CUST-001", "action": "upserted"},
+    ),
+    202: _response(
+        "Accepted for processing",
+        {
+            "status": "accepted",
+            "message": "Customer sync queued",
+            "task_id": "abc-123",
+            "customer_id": "CUST-001",
+        },
+    ),
+    400: _BAD_REQUEST_400,
+    401: _UNAUTHORIZED_401,
+    503: _SERVICE_UNAVAILABLE_503,
+}
+
+_VEHICLE_SYNC_RESPONSES = {
+    200: _response(
+        "Synced inline (sync queue idle, SYNC_INLINE_WHEN_IDLE)",
+        {"status": "success", "plate": "ABC-1234", "action": "upserted"},
+    ),
+    202: _response(
+        "Accepted for processing",
+        {
+            "status": "accepted",
+            "message": "Vehicle sync queued",
+            "task_id": "abc-123",
+            "plate": "ABC-1234",
+        },
+    ),
+    400: _BAD_REQUEST_400,
+    401: _UNAUTHORIZED_401,
+    503: _SERVICE_UNAVAILABLE_503,
+}
+
+_CUSTOMERS_BULK_RESPONSES = {
+    202: _response(
+        "Accepted for processing",
+        {
+            "status": "accepted",
+            "message": "Customer bulk sync queued",
+            "task_ids": ["abc-123"],
+            "count": 250,
+        },
+    ),
+    400: _BAD_REQUEST_400,
+    401: _UNAUTHORIZED_401,
+    503: _SERVICE_UNAVAILABLE_503,
+}
+
+_VEHICLES_BULK_RESPONSES = {
+    202: _response(
+        "Accepted for processing",
+        {
+            "status": "accepted",
+            "message": "Vehicle bulk sync queued",
+            "task_ids": ["abc-123"],
+            "count": 250,
+        },
+    ),
+    400: _BAD_REQUEST_400,
+    401: _UNAUTHORIZED_401,
+    503: _SERVICE_UNAVAILABLE_503,
+}
+
+_TASK_STATUS_RESPONSES = {
+    200: _response(
+        "Task status",
+        {
+            "task_id": "abc-123-def-456",
+            "status": "SUCCESS",
+            "result": {"status": "success", "customer_id": "CLI-001"},
+            "ready": True,
+            "successful": True,
+            "failed": False,
+        },
+    ),
+}
+
+_TASK_STATUS_BULK_RESPONSES = {
+    200: _response(
+        "Status of each requested task, in request order",
+        {
+            "tasks": [
+                {
+                    "task_id": "abc-123",
+                    "status": "SUCCESS",
+                    "result": {"status": "success", "customer_id": "CLI-001"},
+                    "ready": True,
+                    "successful": True,
+                    "failed": False,
+                },
+                {
+                    "task_id": "def-456",
+                    "status": "PENDING",
+                    "ready": False,
+                    "successful": None,
+                    "failed": None,
+                },
+            ],
+        },
+    ),
+    400: _response(
+        "Missing or too many task ids",
+        {"ids": [f"Provide between 1 and {TASK_STATUS_BULK_MAX} task ids"]},
+    ),
+}
+
+_GLOBAL_PHASES_SYNC_RESPONSES = {
+    202: _response(
+        "Accepted for processing",
+        {
+            "status": "accepted",
+            "message": "Global phases sync queued",
+            "task_id": "abc-123",
+            "phases_count": 5,
+            "sync_mode": "full",
+        },
+    ),
+    400: _BAD_REQUEST_400,
+    401: _UNAUTHORIZED_401,
+    503: _SERVICE_UNAVAILABLE_503,
+}
+
+_VEHICLE_PHASES_SYNC_RESPONSES = {
+    202: _response(
+        "Accepted for processing",
+        {
+            "status": "accepted",
+            "message": "Vehicle phases sync queued",
+            "task_id": "abc-123",
+            "plate": "ABC-1234",
+            "phases_count": 5,
+        },
+    ),
+    400: _BAD_REQUEST_400,
+    401: _UNAUTHORIZED_401,
+    503: _SERVICE_UNAVAILABLE_503,
+}
+
+
+def _previous_delivery(idem_key: str, task_id: str):
+    """
+    Registrar la entrega de un webhook y detectar reintentos de Core.
+
+    cache.add es atómico (SET NX en Redis): solo la primera entrega de una
+    clave lo consigue y guarda el task_id reservado para su tarea. Si Redis
+    no está disponible se procesa el webhook (fail-open), ya que las tareas
+    de sync son idempotentes. Si luego falla el encolado, la clave se libera
+    (_release_delivery_on_error) para que el reintento de Core se procese.
+
+    Returns:
+        None si es la primera entrega; si es un reintento, el task_id de la
+        primera ("" si se sincronizó inline y no tiene tarea).
+    """
+    try:
+        if cache.add(idem_key, task_id, timeout=SYNC_IDEMPOTENCY_TTL):
+            return None
+        return cache.get(idem_key, "")
+    except Exception as exc:
+        logger.warning(f"Idempotency check unavailable for {idem_key}: {exc}")
+        return None
+
+
+@contextmanager
+def _release_delivery_on_error(idem_key):
+    """
+    Liberar la clave de idempotencia si el bloque falla (p. ej. broker caído).
+
+    Core recibe un error y reintenta; sin esto el reintento se trataría como
+    duplicado de una tarea que nunca se encoló y la actualización se perdería.
+    """
+    try:
+        yield
+    except BaseException:
+        if idem_key:
+            try:
+                cache.delete(idem_key)
+            except Exception as exc:
+                logger.warning(f"Could not release idempotency key {idem_key}: {exc}")
+        raise
+
+
+def _mark_synced_inline(idem_key: str) -> None:
+    """Indicar a los reintentos que la entrega original no encoló tarea."""
+    try:
+        cache.set(idem_key, "", timeout=SYNC_IDEMPOTENCY_TTL)
+    except Exception as exc:
+        logger.warning(f"Idempotency update unavailable for {idem_key}: {exc}")
+
+
+def _phases_idem_key(prefix: str, sync_data: dict):
+    """
+    Clave de idempotencia de un sync de fases, o None si no trae sync_version.
+
+    Incluye un hash de las fases: la misma versión con otro contenido no se
+    considera reintento.
+    """
+    sync_version = sync_data.get("sync_version")
+    if sync_version is None:
+        return None
+    digest = hashlib.sha1(
+        json.dumps(sync_data["phases"], sort_keys=True).encode()
+    ).hexdigest()
+    return f"{prefix}:{sync_data['sync_mode']}:{sync_version}:{digest}"
+
+
+def _duplicate_response(message: str, task_id: str, **fields):
+    """Respuesta 202 a un reintento, con el task_id de la entrega original."""
+    return Response(
+        {
+            "status": "duplicate",
+            "message": message,
+            "task_id": task_id or None,
+            **fields,
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
+def _accepted_response(prefix: bytes, **fields) -> HttpResponse:
+    """
+    Respuesta 202 JSON sin pasar por la negociación/renderizado de DRF.
+
+    Solo se serializan los valores variables (task_id, id de la entidad).
+    """
+    body = prefix + b"".join(
+        b',"%s":%s' % (key.encode(), json.dumps(value).encode())
+        for key, value in fields.items()
+    ) + b"}"
+    return HttpResponse(
+        body, status=status.HTTP_202_ACCEPTED, content_type="application/json"
+    )
+
+
+def _invalid_payload_response(exc: JsonSchemaValueException):
+    """
+    Respuesta 400 con el mismo formato de errores por campo que DRF.
+
+    exc.name es la ruta del campo inválido ("data.phases[0].order"); la raíz
+    "data" se reporta como non_field_errors.
+    """
+    field = exc.name.partition(".")[2] or "non_field_errors"
+    return Response({field: [exc.message]}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _circuit_open_response():
+    """
+    Rechazar el webhook mientras el circuit breaker de BD está abierto.
+
+    Core reintenta ante un 503, así que no se pierde la actualización y no se
+    encolan tareas que fallarían igualmente.
+    """
+    return Response(
+        {"detail": "Database unavailable, retry later"},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(DB_BREAKER_RECOVERY_TIMEOUT)},
+    )
+
+
+def _queue_length(conn, queue: str) -> int:
+    """
+    Mensajes en espera en la cola del broker.
+
+    Con Redis es un LLEN de la lista de la cola: Redis borra las listas vacías,
+    así que una cola ociosa no existe y LLEN devuelve 0 (un queue_declare
+    pasivo lanzaría ChannelError). Las tareas de sync no usan prioridades, por
+    lo que todos sus mensajes están en la lista base.
+    """
+    channel = conn.default_channel
+    if conn.transport.driver_type == "redis":
+        return channel.client.llen(queue)
+    return channel.queue_declare(queue=queue, passive=True).message_count
+
+
+def _sync_queue_idle(queue: str) -> bool:
+    """
+    Indicar si la cola de sync no tiene trabajo pendiente ni en curso.
+
+    La longitud de la cola no incluye los mensajes ya reservados por un worker
+    (prefetch, ejecución, espera de un reintento): un sync inline podría
+    adelantarse a una versión anterior de la misma entidad. Por eso además se
+    exige que el contador de tareas en curso de la cola (dispatch.py) esté
+    vacío.
 
-class SyncCustomerView(APIView):
+    Solo se cachea el resultado "ocupada", unos segundos: una cola ociosa se
+    vuelve a verificar en cada webhook. Ante cualquier error se asume que hay
+    backlog y se usa la ruta asíncrona.
+    """
+    busy_key = f"{queue}:queue-busy"
+    try:
+        if any(cache.get_many([busy_key, IN_FLIGHT_KEY.format(queue)]).values()):
+            return False
+        with sync_customer_task.app.connection_for_read() as conn:
+            idle = _queue_length(conn, queue) == 0
+        if not idle:
+            cache.set(busy_key, True, timeout=SYNC_QUEUE_BUSY_TTL)
+        return idle
+    except Exception as exc:
+        logger.warning(f"Sync queue depth unavailable: {exc}")
+        return False
+
+
+def _run_inline(sync_func, data: dict, queue: str):
+    """
+    Ejecutar la sincronización en el propio request si la cola está ociosa.
+
+    Retorna el resultado de la sincronización, o None si la ruta inline no
+    aplica o la base de datos falló (en ese caso se encola la tarea Celery,
+    que sí reintenta).
+    """
+    if not settings.SYNC_INLINE_WHEN_IDLE or not _sync_queue_idle(queue):
+        return None
+    try:
+        return sync_func(data)
+    except (OperationalError, InterfaceError) as exc:
+        logger.warning(f"Inline sync failed, falling back to Celery: {exc}")
+        return None
+
+
+class InternalSyncView(APIView):
+    """
+    Base de los webhooks de sincronización, con el stack de DRF reducido.
+
+    Solo autentica con X-Internal-Secret: sin permisos ni throttling, y con
+    un único renderer/parser JSON, por lo que la negociación de contenido se
+    omite (Core siempre envía y acepta JSON).
+    """
+
+    authentication_classes = [InternalServiceAuthentication]
+    permission_classes = []
+    throttle_classes = []
+    parser_classes = [ORJSONParser]
+    renderer_classes = [ORJSONRenderer]
+
+    def perform_content_negotiation(self, request, force=False):
+        renderer = self.renderer_classes[0]()
+        return renderer, renderer.media_type
+
+
+class SyncCustomerView(InternalSyncView):
     """
     Endpoint interno para recibir actualizaciones de clientes desde Core.
 
@@ -36,8 +462,6 @@ class SyncCustomerView(APIView):
         202 Accepted - La tarea de sincronización ha sido encolada.
     """
 
-    authentication_classes = [InternalServiceAuthentication]
-
     @extend_schema(
         summary="Sync customer from Core",
         description=(
@@ -45,45 +469,64 @@ class SyncCustomerView(APIView):
             "The request is queued immediately and processed asynchronously by Celery."
         ),
         request=CustomerSyncSerializer,
-        responses={
-            202: {
-                "description": "Accepted for processing",
-                "example": {
-                    "status": "accepted",
-                    "message": "Customer sync queued",
-                },
-            },
-            400: {
-                "description": "Invalid payload",
-                "example": {"customer_id": ["This field is required."]},
-            },
-            401: {
-                "description": "Invalid API key",
-                "example": {"detail": "Invalid internal API key"},
-            },
-        },
+        responses=_CUSTOMER_SYNC_RESPONSES,
         tags=["Internal API"],
     )
     def post(self, request):
         """Queue customer sync task."""
-        serializer = CustomerSyncSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        # Despachar tarea asíncrona inmediatamente y obtener el task_id
-        task = sync_customer_task.delay(serializer.validated_data)
+        if db_circuit_is_open():
+            return _circuit_open_response()
+
+        try:
+            customer_data = validate_customer(request.data)
+        except JsonSchemaValueException as exc:
+            return _invalid_payload_response(exc)
+
+        customer_id = customer_data["customer_id"]
+        sync_version = customer_data.get("sync_version")
+
+        # Descartar reintentos de la misma versión (sin versión no se puede
+        # distinguir un reintento de una actualización legítima); el task_id
+        # se reserva antes de encolar para poder devolverlo a los reintentos
+        task_id = uuid()
+        idem_key = None
+        if sync_version is not None:
+            idem_key = f"sync:cust:{customer_id}:{sync_version}"
+            previous_task_id = _previous_delivery(idem_key, task_id)
+            if previous_task_id is not None:
+                return _duplicate_response(
+                    "Customer sync already queued", previous_task_id, customer_id=customer_id
+                )
+
+        queue = sync_queue_for(customer_id)
+
+        # Cola ociosa: sincronizar directamente y evitar el salto por Celery.
+        # Si falla sin caer a Celery, Core recibe un 500 y su reintento se procesa
+        with _release_delivery_on_error(idem_key):
+            result = _run_inline(sync_customer, customer_data, queue)
+        if result is not None:
+            if idem_key:
+                _mark_synced_inline(idem_key)
+            return Response(result, status=status.HTTP_200_OK)
+
+        # Despachar tarea (en lote si SYNC_BATCH_MS > 0)
+        with _release_delivery_on_error(idem_key):
+            dispatch(
+                sync_customer_task,
+                [customer_data],
+                queue=queue,
+                task_id=task_id,
+                idem_key=idem_key,
+            )
 
-        return Response(
-            {
-                "status": "accepted",
-                "message": "Customer sync queued",
-                "task_id": task.id,  # Para rastrear la tarea
-                "customer_id": serializer.validated_data.get("customer_id"),
-            },
-            status=status.HTTP_202_ACCEPTED,
+        return _accepted_response(
+            _CUSTOMER_ACCEPTED_PREFIX,
+            task_id=task_id,  # Para rastrear la tarea
+            customer_id=customer_id,
         )
 
 
-class SyncVehicleView(APIView):
+class SyncVehicleView(InternalSyncView):
     """
     Endpoint interno para recibir actualizaciones de vehículos desde Core.
 
@@ -97,8 +540,6 @@ class SyncVehicleView(APIView):
         202 Accepted - La tarea de sincronización ha sido encolada.
     """
 
-    authentication_classes = [InternalServiceAuthentication]
-
     @extend_schema(
         summary="Sync vehicle from Core",
         description=(
@@ -106,39 +547,176 @@ class SyncVehicleView(APIView):
             "The request is queued immediately and processed asynchronously by Celery."
         ),
         request=VehicleSyncSerializer,
-        responses={
-            202: {
-                "description": "Accepted for processing",
-                "example": {
-                    "status": "accepted",
-                    "message": "Vehicle sync queued",
-                },
-            },
-            400: {
-                "description": "Invalid payload",
-                "example": {"plate": ["This field is required."]},
-            },
-            401: {
-                "description": "Invalid API key",
-                "example": {"detail": "Invalid internal API key"},
-            },
-        },
+        responses=_VEHICLE_SYNC_RESPONSES,
         tags=["Internal API"],
     )
     def post(self, request):
         """Queue vehicle sync task."""
-        serializer = VehicleSyncSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        if db_circuit_is_open():
+            return _circuit_open_response()
+
+        try:
+            vehicle_data = validate_vehicle(request.data)
+        except JsonSchemaValueException as exc:
+            return _invalid_payload_response(exc)
+
+        plate = vehicle_data["plate"]
+        sync_version = vehicle_data.get("sync_version")
+
+        # Descartar reintentos de la misma versión (sin versión no se puede
+        # distinguir un reintento de una actualización legítima); el task_id
+        # se reserva antes de encolar para poder devolverlo a los reintentos
+        task_id = uuid()
+        idem_key = None
+        if sync_version is not None:
+            idem_key = f"sync:veh:{plate}:{sync_version}"
+            previous_task_id = _previous_delivery(idem_key, task_id)
+            if previous_task_id is not None:
+                return _duplicate_response(
+                    "Vehicle sync already queued", previous_task_id, plate=plate
+                )
+
+        queue = sync_queue_for(plate)
+
+        # Cola ociosa: sincronizar directamente y evitar el salto por Celery.
+        # Si falla sin caer a Celery, Core recibe un 500 y su reintento se procesa
+        with _release_delivery_on_error(idem_key):
+            result = _run_inline(sync_vehicle, vehicle_data, queue)
+        if result is not None:
+            if idem_key:
+                _mark_synced_inline(idem_key)
+            return Response(result, status=status.HTTP_200_OK)
+
+        # Despachar tarea (en lote si SYNC_BATCH_MS > 0)
+        with _release_delivery_on_error(idem_key):
+            dispatch(
+                sync_vehicle_task,
+                [vehicle_data],
+                queue=queue,
+                task_id=task_id,
+                idem_key=idem_key,
+            )
+
+        return _accepted_response(
+            _VEHICLE_ACCEPTED_PREFIX,
+            task_id=task_id,  # Para rastrear la tarea
+            plate=plate,
+        )
+
+
+def _dispatch_in_chunks(task, items: list, key: str) -> list:
+    """
+    Encolar `task` por lotes de hasta SYNC_BULK_BATCH_SIZE items.
+
+    Los items se agrupan por su cola de sync (sync_queue_for(item[key])), así
+    un lote nunca se ejecuta en paralelo con la tarea individual de una de sus
+    entidades. No hay clave de idempotencia por lote: un reintento de Core
+    vuelve a encolar los lotes, que son idempotentes.
+    """
+    by_queue = {}
+    for item in items:
+        by_queue.setdefault(sync_queue_for(item[key]), []).append(item)
+
+    return [
+        dispatch(task, [queue_items[i:i + SYNC_BULK_BATCH_SIZE]], queue=queue)
+        for queue, queue_items in by_queue.items()
+        for i in range(0, len(queue_items), SYNC_BULK_BATCH_SIZE)
+    ]
+
+
+class SyncCustomersBulkView(InternalSyncView):
+    """
+    Endpoint interno para recibir lotes de clientes desde Core.
+
+    Acepta una lista (1 a SYNC_BULK_MAX_ITEMS) de clientes con el mismo
+    formato que SyncCustomerView y encola una tarea por cada lote de
+    SYNC_BULK_BATCH_SIZE registros.
+
+    Authentication:
+        Requiere header X-Internal-Secret con API key compartida.
+
+    Response:
+        202 Accepted - Las tareas de sincronización han sido encoladas.
+    """
 
-        # Despachar tarea asíncrona inmediatamente y obtener el task_id
-        task = sync_vehicle_task.delay(serializer.validated_data)
+    @extend_schema(
+        summary="Bulk sync customers from Core",
+        description=(
+            "Webhook endpoint for Core service to push many customer updates at once "
+            f"(1 to {SYNC_BULK_MAX_ITEMS} items). "
+            "The list is split into batches and each batch is processed by a single "
+            "Celery task using bulk_create/bulk_update."
+        ),
+        request=CustomerSyncSerializer(many=True),
+        responses=_CUSTOMERS_BULK_RESPONSES,
+        tags=["Internal API"],
+    )
+    def post(self, request):
+        """Queue customer bulk sync tasks."""
+        if db_circuit_is_open():
+            return _circuit_open_response()
+
+        try:
+            customers = validate_customers_bulk(request.data)
+        except JsonSchemaValueException as exc:
+            return _invalid_payload_response(exc)
+        task_ids = _dispatch_in_chunks(sync_customers_bulk_task, customers, "customer_id")
 
         return Response(
             {
                 "status": "accepted",
-                "message": "Vehicle sync queued",
-                "task_id": task.id,  # Para rastrear la tarea
-                "plate": serializer.validated_data.get("plate"),
+                "message": "Customer bulk sync queued",
+                "task_ids": task_ids,
+                "count": len(customers),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class SyncVehiclesBulkView(InternalSyncView):
+    """
+    Endpoint interno para recibir lotes de vehículos desde Core.
+
+    Acepta una lista (1 a SYNC_BULK_MAX_ITEMS) de vehículos con el mismo
+    formato que SyncVehicleView y encola una tarea por cada lote de
+    SYNC_BULK_BATCH_SIZE registros.
+
+    Authentication:
+        Requiere header X-Internal-Secret con API key compartida.
+
+    Response:
+        202 Accepted - Las tareas de sincronización han sido encoladas.
+    """
+
+    @extend_schema(
+        summary="Bulk sync vehicles from Core",
+        description=(
+            "Webhook endpoint for Core service to push many vehicle updates at once "
+            f"(1 to {SYNC_BULK_MAX_ITEMS} items). "
+            "The list is split into batches and each batch is processed by a single "
+            "Celery task using bulk_create/bulk_update."
+        ),
+        request=VehicleSyncSerializer(many=True),
+        responses=_VEHICLES_BULK_RESPONSES,
+        tags=["Internal API"],
+    )
+    def post(self, request):
+        """Queue vehicle bulk sync tasks."""
+        if db_circuit_is_open():
+            return _circuit_open_response()
+
+        try:
+            vehicles = validate_vehicles_bulk(request.data)
+        except JsonSchemaValueException as exc:
+            return _invalid_payload_response(exc)
+        task_ids = _dispatch_in_chunks(sync_vehicles_bulk_task, vehicles, "plate")
+
+        return Response(
+            {
+                "status": "accepted",
+                "message": "Vehicle bulk sync queued",
+                "task_ids": task_ids,
+                "count": len(vehicles),
             },
             status=status.HTTP_202_ACCEPTED,
         )
@@ -154,49 +732,134 @@ class TaskStatusView(APIView):
     @extend_schema(
         summary="Check task status",
         description="Check the status of a Celery task by its task_id",
-        responses={
-            200: {
-                "description": "Task status",
-                "example": {
-                    "task_id": "abc-123-def-456",
-                    "status": "SUCCESS",
-                    "result": {"status": "success", "customer_id": "CLI-001"},
-                    "ready": True,
-                    "successful": True,
-                    "failed": False,
-                },
-            },
-        },
+        responses=_TASK_STATUS_RESPONSES,
         tags=["Internal API"],
     )
     def get(self, request, task_id):
         """Get task status by task_id."""
+        # Una sola lectura del backend (django-db): status, result y traceback
+        # salen del mismo registro en lugar de una consulta por atributo
         result = AsyncResult(task_id)
+        meta = result.backend.get_task_meta(result.id)
+        return Response(_task_status_data(task_id, meta))
 
-        response_data = {
-            "task_id": task_id,
-            "status": result.status,  # PENDING, STARTED, SUCCESS, FAILURE, RETRY
-            "ready": result.ready(),
-            "successful": result.successful() if result.ready() else None,
-            "failed": result.failed() if result.ready() else None,
-        }
 
-        # Add result or error info if available
-        if result.ready():
-            if result.successful():
-                response_data["result"] = result.result
-            elif result.failed():
-                response_data["error"] = str(result.info)
-                response_data["traceback"] = result.traceback
+class TaskStatusBulkView(APIView):
+    """
+    Endpoint público para verificar el estado de varias tareas de Celery.
+
+    Evita una petición (y una lectura del backend) por task_id cuando se
+    sigue el progreso de muchas tareas, p. ej. los lotes de un bulk sync.
+    """
+
+    @extend_schema(
+        operation_id="internal_v1_tasks_status_bulk",
+        summary="Check the status of several tasks",
+        description=(
+            "Check the status of up to "
+            f"{TASK_STATUS_BULK_MAX} Celery tasks in one request. "
+            "Unknown task ids are reported as PENDING."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "ids",
+                str,
+                required=True,
+                description="Comma-separated task ids",
+            ),
+        ],
+        responses=_TASK_STATUS_BULK_RESPONSES,
+        tags=["Internal API"],
+    )
+    def get(self, request):
+        """Get the status of the comma-separated task ids in ?ids=."""
+        task_ids = list(dict.fromkeys(
+            task_id for task_id in request.query_params.get("ids", "").split(",")
+            if task_id
+        ))
+        if not task_ids or len(task_ids) > TASK_STATUS_BULK_MAX:
+            return Response(
+                {"ids": [f"Provide between 1 and {TASK_STATUS_BULK_MAX} task ids"]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        metas = _task_metas(task_ids)
+        return Response(
+            {"tasks": [_task_status_data(task_id, metas[task_id]) for task_id in task_ids]}
+        )
+
+
+def _task_status_data(task_id: str, meta: dict) -> dict:
+    """Construir la respuesta de estado de una tarea a partir de su meta."""
+    task_status = meta["status"]  # PENDING, STARTED, SUCCESS, FAILURE, RETRY
+    ready = task_status in states.READY_STATES
+
+    response_data = {
+        "task_id": task_id,
+        "status": task_status,
+        "ready": ready,
+        "successful": task_status == states.SUCCESS if ready else None,
+        "failed": task_status == states.FAILURE if ready else None,
+    }
+
+    # Add result or error info if available
+    if task_status == states.SUCCESS:
+        response_data["result"] = meta["result"]
+    elif task_status == states.FAILURE:
+        response_data["error"] = str(meta["result"])
+        response_data["traceback"] = meta.get("traceback")
+
+    return response_data
 
-        return Response(response_data)
+
+def _task_metas(task_ids: list) -> dict:
+    """
+    Leer status, result y traceback de varias tareas.
+
+    Con el backend django-db (expone TaskModel) es una sola consulta y con
+    Redis un solo MGET; las tareas sin registro se reportan como PENDING,
+    igual que get_task_meta. Otros backends se leen tarea por tarea.
+    """
+    backend = sync_customer_task.app.backend
+    metas = {
+        task_id: {"status": states.PENDING, "result": None, "traceback": None}
+        for task_id in task_ids
+    }
+
+    if isinstance(backend, KeyValueStoreBackend):
+        keys = [backend.get_key_for_task(task_id) for task_id in task_ids]
+        values = backend.mget(keys)
+        if hasattr(values, "items"):  # memcached/cache backends return a dict
+            values = [values.get(key) for key in keys]
+        for task_id, value in zip(task_ids, values):
+            if value is not None:
+                metas[task_id] = backend.decode_result(value)
+        return metas
+
+    task_model = getattr(backend, "TaskModel", None)
+    if task_model is None:
+        return {task_id: backend.get_task_meta(task_id) for task_id in task_ids}
+
+    rows = task_model._default_manager.filter(task_id__in=task_ids).only(
+        "task_id", "status", "result", "traceback", "content_encoding"
+    )
+    for row in rows:
+        result = backend.decode_content(row, row.result)
+        if row.status in states.EXCEPTION_STATES:
+            result = backend.exception_to_python(result)
+        metas[row.task_id] = {
+            "status": row.status,
+            "result": result,
+            "traceback": row.traceback,
+        }
+    return metas
 
 
 # ============================================================================
 # Phase Synchronization Views
 # ============================================================================
 
-class SyncGlobalPhasesView(APIView):
+class SyncGlobalPhasesView(InternalSyncView):
     """
     Endpoint interno para sincronizar fases globales desde Core.
 
@@ -211,8 +874,6 @@ class SyncGlobalPhasesView(APIView):
         202 Accepted - La tarea de sincronización ha sido encolada.
     """
 
-    authentication_classes = [InternalServiceAuthentication]
-
     @extend_schema(
         summary="Sync global phases from Core",
         description=(
@@ -222,42 +883,47 @@ class SyncGlobalPhasesView(APIView):
             "Processed asynchronously by Celery."
         ),
         request=GlobalPhaseSyncSerializer,
-        responses={
-            202: {
-                "description": "Accepted for processing",
-                "example": {
-                    "status": "accepted",
-                    "message": "Global phases sync queued",
-                    "task_id": "abc-123",
-                    "phases_count": 5,
-                    "sync_mode": "full",
-                },
-            },
-            400: {"description": "Invalid payload"},
-            401: {"description": "Invalid API key"},
-        },
+        responses=_GLOBAL_PHASES_SYNC_RESPONSES,
         tags=["Internal API"],
     )
     def post(self, request):
         """Queue global phases sync task."""
-        serializer = GlobalPhaseSyncSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        task = sync_global_phases_task.delay(serializer.validated_data)
+        if db_circuit_is_open():
+            return _circuit_open_response()
+
+        try:
+            sync_data = validate_global_phases(request.data)
+        except JsonSchemaValueException as exc:
+            return _invalid_payload_response(exc)
+
+        task_id = uuid()
+        idem_key = _phases_idem_key("sync:gphases", sync_data)
+        if idem_key:
+            previous_task_id = _previous_delivery(idem_key, task_id)
+            if previous_task_id is not None:
+                return _duplicate_response(
+                    "Global phases sync already queued", previous_task_id
+                )
+
+        # Despachar tarea (en lote si SYNC_BATCH_MS > 0), en la cola por defecto
+        with _release_delivery_on_error(idem_key):
+            dispatch(
+                sync_global_phases_task, [sync_data], task_id=task_id, idem_key=idem_key
+            )
 
         return Response(
             {
                 "status": "accepted",
                 "message": "Global phases sync queued",
-                "task_id": task.id,
-                "phases_count": len(serializer.validated_data["phases"]),
-                "sync_mode": serializer.validated_data.get("sync_mode", "partial"),
+                "task_id": task_id,
+                "phases_count": len(sync_data["phases"]),
+                "sync_mode": sync_data["sync_mode"],
             },
             status=status.HTTP_202_ACCEPTED,
         )
 
 
-class SyncVehiclePhasesView(APIView):
+class SyncVehiclePhasesView(InternalSyncView):
     """
     Endpoint interno para sincronizar configuración de fases por vehículo.
 
@@ -270,67 +936,69 @@ class SyncVehiclePhasesView(APIView):
         Requiere header X-Internal-Secret con API key compartida.
 
     Response:
-        202 Accepted - La tarea de sincronización ha sido encolada.
-        404 Not Found - El vehículo no existe.
+        202 Accepted - La tarea de sincronización ha sido encolada. Si la
+            placa o algún slug de fase no existen la tarea termina en FAILURE
+            (consultar TaskStatusView con el task_id).
     """
 
-    authentication_classes = [InternalServiceAuthentication]
-
     @extend_schema(
         summary="Sync vehicle phase configuration",
         description=(
             "Configure custom phase settings for a specific vehicle. "
             "Phases must reference existing global ServicePhase slugs. "
+            "An unknown plate or phase slug makes the task fail; poll "
+            "/tasks/{task_id}/status/ to check the outcome. "
             "Supports 'full' mode (replace all vehicle phases) "
             "and 'partial' mode (update only provided phases)."
         ),
         request=VehiclePhaseSyncSerializer,
-        responses={
-            202: {
-                "description": "Accepted for processing",
-                "example": {
-                    "status": "accepted",
-                    "message": "Vehicle phases sync queued",
-                    "task_id": "abc-123",
-                    "plate": "ABC-1234",
-                    "phases_count": 5,
-                },
-            },
-            400: {"description": "Invalid payload or unknown phase slugs"},
-            401: {"description": "Invalid API key"},
-            404: {"description": "Vehicle not found"},
-        },
+        responses=_VEHICLE_PHASES_SYNC_RESPONSES,
         tags=["Internal API"],
     )
     def post(self, request, plate):
         """Queue vehicle phases sync task."""
-        from apps.notifications.models import Vehicle
-
-        # Verificar que el vehículo existe
-        if not Vehicle.objects.filter(plate=plate).exists():
-            return Response(
-                {"error": f"Vehículo con placa '{plate}' no encontrado"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-
-        serializer = VehiclePhaseSyncSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        # Agregar plate a los datos de la tarea
+        if db_circuit_is_open():
+            return _circuit_open_response()
+
+        # La existencia del vehículo se verifica en la tarea (sin consulta a
+        # la BD en el request); una placa desconocida deja la tarea en FAILURE
+        try:
+            sync_data = validate_vehicle_phases(request.data)
+        except JsonSchemaValueException as exc:
+            return _invalid_payload_response(exc)
+
+        task_id = uuid()
+        idem_key = _phases_idem_key(f"sync:vphases:{plate}", sync_data)
+        if idem_key:
+            previous_task_id = _previous_delivery(idem_key, task_id)
+            if previous_task_id is not None:
+                return _duplicate_response(
+                    "Vehicle phases sync already queued", previous_task_id, plate=plate
+                )
+
+        # Agregar plate a los datos de la tarea (la placa de la URL prevalece)
         task_data = {
+            **sync_data,
             "plate": plate,
-            **serializer.validated_data,
         }
 
-        task = sync_vehicle_phases_task.delay(task_data)
+        # Misma cola que sync_vehicle_task para esta placa
+        with _release_delivery_on_error(idem_key):
+            dispatch(
+                sync_vehicle_phases_task,
+                [task_data],
+                queue=sync_queue_for(plate),
+                task_id=task_id,
+                idem_key=idem_key,
+            )
 
         return Response(
             {
                 "status": "accepted",
                 "message": "Vehicle phases sync queued",
-                "task_id": task.id,
+                "task_id": task_id,
                 "plate": plate,
-                "phases_count": len(serializer.validated_data["phases"]),
+                "phases_count": len(sync_data["phases"]),
             },
             status=status.HTTP_202_ACCEPTED,
         )
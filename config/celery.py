@@ -5,6 +5,7 @@ import os
 
 from celery import Celery
 from celery.schedules import crontab
+from kombu import Exchange, Queue
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
@@ -32,6 +33,12 @@ app.conf.beat_schedule = {
         "schedule": crontab(minute=0),  # Every hour at minute 0
         "options": {"queue": "notifications"},
     },
+    # Report vehicles synced before their customer daily at 3 AM
+    "report-orphan-vehicles-daily": {
+        "task": "apps.synchronization.tasks.report_orphan_vehicles_task",
+        "schedule": crontab(hour=3, minute=0),
+        "options": {"queue": "maintenance"},
+    },
     # Clean old logs weekly (Sundays at midnight)
     "cleanup-old-notification-logs": {
         "task": "apps.analytics.tasks.cleanup_old_logs",
@@ -40,6 +47,14 @@ app.conf.beat_schedule = {
     },
 }
 
+# Queues consumed by the workers (-Q), declared like Celery's auto-created ones
+# (own direct exchange, routing key = queue name). "sync.<n>" shard queues
+# (SYNC_SHARDS > 1) are still created on demand (task_create_missing_queues)
+app.conf.task_queues = tuple(
+    Queue(name, Exchange(name), routing_key=name)
+    for name in ("notifications", "sync", "maintenance")
+)
+
 # Task routing
 app.conf.task_routes = {
     "apps.notifications.tasks.*": {"queue": "notifications"},
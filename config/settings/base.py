@@ -3,64 +3,115 @@ Base settings for Ambacar Notification Service.
 """
 import os
 import socket
+import sys
 from pathlib import Path
 
 import dj_database_url
 from dotenv import load_dotenv
 from corsheaders.defaults import default_headers
 
-# Load environment variables from .env file
-load_dotenv()
+
+def _csv(name: str, default: str) -> tuple:
+    """Parse a comma-separated environment variable, ignoring blanks and spaces."""
+    return tuple(
+        item.strip() for item in os.environ.get(name, default).split(",") if item.strip()
+    )
+
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
+# Load environment variables from the project's .env file (local development).
+# Deployments that inject the environment set LOAD_DOTENV=false to skip it
+_DOTENV_PATH = BASE_DIR / ".env"
+if os.environ.get("LOAD_DOTENV", "True").lower() == "true" and _DOTENV_PATH.exists():
+    load_dotenv(_DOTENV_PATH)
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.environ.get("SECRET_KEY", "django-insecure-change-me-in-production")
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.environ.get("DEBUG", "False").lower() == "true"
 
-ALLOWED_HOSTS = os.environ.get("ALLOWED_HOSTS", "localhost,127.0.0.1").split(",")
+ALLOWED_HOSTS = _csv("ALLOWED_HOSTS", "localhost,127.0.0.1")
+
+# Celery result backend. django-db (default) keeps results in Postgres, visible
+# in the admin and without extra Redis commands (Upstash tier). Point it at
+# Redis (e.g. the REDIS_URL) to take the per-task result write off the database
+_CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND") or "django-db"
+_STORE_RESULTS_IN_DB = _CELERY_RESULT_BACKEND == "django-db"
+
+# Serve static files (admin, browsable API) from Django with WhiteNoise. An
+# API-only deployment sets SERVE_STATIC=false to drop staticfiles and WhiteNoise
+# entirely (no collectstatic, no finder scan); Swagger UI loads from its CDN
+SERVE_STATIC = os.environ.get("SERVE_STATIC", "True").lower() == "true"
+
+# Browser-facing features: sessions, messages and the admin site that needs them.
+# An API-only deployment sets ENABLE_SESSIONS=false to drop the apps, their
+# middleware and the /admin/ URL
+ENABLE_SESSIONS = os.environ.get("ENABLE_SESSIONS", "True").lower() == "true"
+
+# One-shot management commands (migrate, collectstatic, shell, ...), as
+# opposed to the long-running web, worker and beat processes
+_MANAGEMENT_COMMAND = (
+    sys.argv[0].endswith("manage.py") and "runserver" not in sys.argv[1:2]
+)
+
+# Only the beat process uses django_celery_beat (DatabaseScheduler): web and
+# worker processes skip loading its models. Set ENABLE_BEAT_DB=true on beat.
+# Management commands always load it, so a plain "manage.py migrate" (release
+# step, container start) creates its tables whether or not the flag is set
+ENABLE_BEAT_DB = os.environ.get("ENABLE_BEAT_DB", "False").lower() == "true"
 
 # Application definition
-DJANGO_APPS = [
-    "django.contrib.admin",
+DJANGO_APPS = (
+    *(("django.contrib.admin",) if ENABLE_SESSIONS else ()),
     "django.contrib.auth",
     "django.contrib.contenttypes",
-    "django.contrib.sessions",
-    "django.contrib.messages",
-    "django.contrib.staticfiles",
-]
+    *(("django.contrib.sessions", "django.contrib.messages") if ENABLE_SESSIONS else ()),
+    *(("django.contrib.staticfiles",) if SERVE_STATIC else ()),
+)
 
-THIRD_PARTY_APPS = [
+THIRD_PARTY_APPS = (
     "rest_framework",
     "drf_spectacular",
     "corsheaders",
-    "django_celery_beat",
-    "django_celery_results",
-]
+    *(("django_celery_beat",) if ENABLE_BEAT_DB or _MANAGEMENT_COMMAND else ()),
+    *(("django_celery_results",) if _STORE_RESULTS_IN_DB else ()),
+)
 
-LOCAL_APPS = [
+LOCAL_APPS = (
     "apps.core",
     "apps.notifications",
     "apps.analytics",
     "apps.synchronization",
-]
+)
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
-MIDDLEWARE = [
+_STATIC_MIDDLEWARE = ("whitenoise.middleware.WhiteNoiseMiddleware",) if SERVE_STATIC else ()
+_SESSION_MIDDLEWARE = (
+    ("django.contrib.sessions.middleware.SessionMiddleware",) if ENABLE_SESSIONS else ()
+)
+_AUTH_MIDDLEWARE = (
+    (
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+    )
+    if ENABLE_SESSIONS
+    else ()
+)
+
+MIDDLEWARE = (
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    *_STATIC_MIDDLEWARE,  # Must follow SecurityMiddleware
+    *_SESSION_MIDDLEWARE,
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    *_AUTH_MIDDLEWARE,
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-]
+)
 
 ROOT_URLCONF = "config.urls"
 
@@ -83,13 +134,29 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 
 # Database - PostgreSQL via dj-database-url (Supabase compatible)
+# DATABASE_TRANSACTION_POOLING=true when DATABASE_URL points to a transaction-mode
+# pooler (Supabase pooler port 6543 / PgBouncer): the pooler owns connection
+# lifetime, and server-side cursors / prepared statements don't survive
+# switching server connections between transactions
+DATABASE_TRANSACTION_POOLING = (
+    os.environ.get("DATABASE_TRANSACTION_POOLING", "False").lower() == "true"
+)
+# One-shot management commands (migrate, collectstatic, ...) exit right away,
+# so a persistent connection would only linger idle on the server
+_CONN_MAX_AGE = (
+    0 if DATABASE_TRANSACTION_POOLING or _MANAGEMENT_COMMAND else 600
+)
 DATABASES = {
     "default": dj_database_url.config(
         default=os.environ.get("DATABASE_URL", "sqlite:///db.sqlite3"),
-        conn_max_age=600,
+        conn_max_age=_CONN_MAX_AGE,
         conn_health_checks=True,
+        disable_server_side_cursors=DATABASE_TRANSACTION_POOLING,
     )
 }
+if DATABASE_TRANSACTION_POOLING and "postgresql" in DATABASES["default"]["ENGINE"]:
+    # psycopg 3 prepares statements after a few executions; disable it
+    DATABASES["default"].setdefault("OPTIONS", {})["prepare_threshold"] = None
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -107,8 +174,14 @@ USE_TZ = True
 
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = "/static/"
-STATIC_ROOT = BASE_DIR / "staticfiles"
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+if SERVE_STATIC:
+    STATIC_ROOT = BASE_DIR / "staticfiles"
+    STORAGES = {
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {
+            "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"
+        },
+    }
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -121,10 +194,10 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "apps.core.renderers.ORJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "apps.core.parsers.ORJSONParser",
     ],
     "EXCEPTION_HANDLER": "rest_framework.views.exception_handler",
 }
@@ -157,12 +230,12 @@ CORS_ALLOW_ALL_ORIGINS = DEBUG
 # Allowed origins for production (localhost + Vercel deployments)
 if not DEBUG:
     # Static origins: localhost with common ports + production domain
-    CORS_ALLOWED_ORIGINS = os.environ.get(
+    CORS_ALLOWED_ORIGINS = _csv(
         "CORS_ALLOWED_ORIGINS",
         "http://localhost:3000,http://localhost:3001,http://localhost:8080,http://localhost:5173,"
         "http://127.0.0.1:3000,http://127.0.0.1:3001,http://127.0.0.1:8080,http://127.0.0.1:5173,"
         "https://ambacar-service-pwa.vercel.app"
-    ).split(",")
+    )
 
     # Dynamic origins: Vercel preview deployments (regex pattern)
     # Pattern matches: https://ambacar-service-{hash}-diego-toscanos-projects.vercel.app
@@ -194,15 +267,30 @@ CORS_ALLOW_METHODS = [
 # =============================================================================
 # Celery Configuration
 # =============================================================================
-CELERY_BROKER_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
-CELERY_RESULT_BACKEND = "django-db"
-CELERY_ACCEPT_CONTENT = ["json"]
+_REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+# TLS Redis (Upstash and other rediss:// providers) gets its own tuning below
+_USING_REDIS_SSL = _REDIS_URL.startswith("rediss://")
+
+CELERY_BROKER_URL = _REDIS_URL
+CELERY_RESULT_BACKEND = _CELERY_RESULT_BACKEND
+CELERY_ACCEPT_CONTENT = ["json", "msgpack"]
+# Sync tasks (phase lists, bulk payloads) override this with msgpack in
+# SYNC_TASK_OPTIONS; their payloads are plain JSON-decoded data. Notification
+# tasks stay on json: their args may carry UUIDs/datetimes (event context),
+# which kombu's json encoder handles and msgpack does not.
 CELERY_TASK_SERIALIZER = "json"
+# django-db stores results as text, so binary msgpack results would be base64'd
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
-CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+if ENABLE_BEAT_DB:
+    CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 CELERY_TASK_TRACK_STARTED = False  # Reduces PUBLISH commands (no "task started" events)
-CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
+# Notification/sync tasks finish in seconds (EVOLUTION_TIMEOUT, EMAIL_TIMEOUT);
+# a stuck one gets SoftTimeLimitExceeded, then is killed, freeing the worker.
+# Enforced by the prefork pool only (--pool=solo ignores time limits).
+# Periodic sweeps (maintenance queue) set longer limits on the task itself
+CELERY_TASK_TIME_LIMIT = int(os.environ.get("CELERY_TASK_TIME_LIMIT", "300"))
+CELERY_TASK_SOFT_TIME_LIMIT = int(os.environ.get("CELERY_TASK_SOFT_TIME_LIMIT", "240"))
 
 # Cancel long-running tasks on connection loss to prevent duplicate executions
 # This will be the default behavior in Celery 6.0
@@ -213,24 +301,23 @@ CELERY_WORKER_CANCEL_LONG_RUNNING_TASKS_ON_CONNECTION_LOSS = True
 CELERY_TASK_SEND_SENT_EVENT = False
 CELERY_WORKER_SEND_TASK_EVENTS = False
 
-# Heartbeat interval: adaptive based on Redis type
-# Upstash has 310s idle timeout, so we use 240s to stay safely below that
-# Local Redis can use default or shorter interval for faster failure detection
-_redis_url = os.environ.get("REDIS_URL", "")
-if _redis_url.startswith("rediss://"):
-    CELERY_BROKER_HEARTBEAT = 240  # 4 minutes for Upstash SSL
-else:
-    CELERY_BROKER_HEARTBEAT = 60  # 1 minute for local Redis (faster failure detection)
-
 # Disable prefetch to reduce memory and Redis commands on idle workers
-CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# (sync tasks are I/O-bound; a higher value lets one worker hoard the backlog)
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(os.environ.get("CELERY_PREFETCH_MULTIPLIER", "1"))
+
+# Recycle prefork children periodically to release leaked memory
+# (ignored by --pool=solo, used by the default deployment)
+CELERY_WORKER_MAX_TASKS_PER_CHILD = int(os.environ.get("CELERY_MAX_TASKS_PER_CHILD", "200"))
 
 # Optimization: Reduce BRPOP polling frequency (critical for Upstash free tier)
 # Adaptive configuration based on Redis type (local vs SSL/Upstash)
-_redis_url = os.environ.get("REDIS_URL", "")
-_using_redis_ssl = _redis_url.startswith("rediss://")
+# Heartbeat interval: Upstash has 310s idle timeout, so we use 240s to stay
+# safely below that; local Redis uses a shorter interval for faster failure detection
+if _USING_REDIS_SSL:
+    import ssl
+
+    CELERY_BROKER_HEARTBEAT = 240  # 4 minutes for Upstash SSL
 
-if _using_redis_ssl:
     # Upstash Redis with SSL: Use optimized settings for remote SSL connections
     CELERY_BROKER_TRANSPORT_OPTIONS = {
         'visibility_timeout': 3600,  # 1 hour (Celery default)
@@ -243,33 +330,76 @@ if _using_redis_ssl:
             socket.TCP_KEEPCNT: 3,     # Number of failed probes before giving up
         },
         'max_connections': 5,
+        'health_check_interval': 30,  # PING idle pooled connections before reuse
+    }
+
+    # SSL Configuration for Redis (required for Upstash and other TLS Redis providers)
+    # Broker and result backend share one dict so they can't drift apart
+    CELERY_BROKER_USE_SSL = CELERY_REDIS_BACKEND_USE_SSL = {
+        "ssl_cert_reqs": ssl.CERT_REQUIRED,
     }
 else:
+    CELERY_BROKER_HEARTBEAT = 60  # 1 minute for local Redis (faster failure detection)
+
     # Local Redis without SSL: Use simpler, more stable settings
     CELERY_BROKER_TRANSPORT_OPTIONS = {
         'visibility_timeout': 3600,  # 1 hour (Celery default)
         'socket_timeout': 120,  # Longer timeout for stable local connections
         'socket_connect_timeout': 10,  # Quick connect for local Redis
+        'socket_keepalive': True,
+        'socket_keepalive_options': {
+            socket.TCP_KEEPIDLE: 60,
+        },
         'max_connections': 10,  # More connections for local Redis (no tier limits)
+        'health_check_interval': 30,  # PING idle pooled connections before reuse
     }
 
-# Limit broker connection pool (prevents connection leaks)
-CELERY_BROKER_POOL_LIMIT = 5
+# Limit broker connection pool (prevents connection leaks). Web workers publish
+# sync tasks from many threads; a pool that is too small makes each enqueue
+# open/close its own connection. Upstash keeps the small default (tier limits)
+CELERY_BROKER_POOL_LIMIT = int(
+    os.environ.get("CELERY_BROKER_POOL_LIMIT", "5" if _USING_REDIS_SSL else "50")
+)
+
+# Keep retrying the broker instead of exiting: on worker startup, after a
+# lost connection (0 = no retry limit) and on channel errors while publishing
+CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+CELERY_BROKER_CONNECTION_MAX_RETRIES = 0
+CELERY_BROKER_CHANNEL_ERROR_RETRY = True
 
 # Expire task results after 24 hours (reduces database cleanup overhead)
 CELERY_RESULT_EXPIRES = 86400  # 24 hours in seconds
 
-# SSL Configuration for Redis (required for Upstash and other TLS Redis providers)
-# Only apply SSL settings when using rediss:// scheme
-_redis_url = os.environ.get("REDIS_URL", "")
-if _redis_url.startswith("rediss://"):
-    import ssl
-    CELERY_BROKER_USE_SSL = {
-        "ssl_cert_reqs": ssl.CERT_REQUIRED,
-    }
-    CELERY_REDIS_BACKEND_USE_SSL = {
-        "ssl_cert_reqs": ssl.CERT_REQUIRED,
+# =============================================================================
+# Cache (Redis) - webhook idempotency keys
+# =============================================================================
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": _REDIS_URL,
+        "KEY_PREFIX": "ambacar",
     }
+}
+
+# Process single customer/vehicle webhooks inline (200 instead of 202 + task_id)
+# when the entity's sync queue has no backlog and no task in flight. Opt-in:
+# callers lose the task_id. Set it on both web and workers (workers decrement
+# the in-flight counter when a sync task finishes).
+SYNC_INLINE_WHEN_IDLE = os.environ.get("SYNC_INLINE_WHEN_IDLE", "False").lower() == "true"
+
+# Number of "sync.<n>" queues that single-entity sync tasks are sharded into by
+# customer_id/plate. 1 keeps the single "sync" queue. With N > 1, run one worker
+# with --concurrency=1 per queue (-Q sync.0, -Q sync.1, ...).
+SYNC_SHARDS = int(os.environ.get("SYNC_SHARDS", "1"))
+
+# Buffer the sync webhook tasks (customers, vehicles, phases, bulk) and publish
+# them to the broker in batches every SYNC_BATCH_MS milliseconds from a
+# background thread (0 = publish inline). Batched messages are lost if the web
+# process dies before the flush, or if the broker rejects both the batch and
+# the per-message fallback. On the Redis transport each message is still one
+# LPUSH: batching takes the broker latency off the request, it does not reduce
+# round trips.
+SYNC_BATCH_MS = int(os.environ.get("SYNC_BATCH_MS", "0"))
 
 # =============================================================================
 # Email Configuration (SMTP)
@@ -284,6 +414,8 @@ EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "")
 EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "")
 EMAIL_USE_TLS = os.environ.get("EMAIL_USE_TLS", "True").lower() == "true"
 EMAIL_USE_SSL = os.environ.get("EMAIL_USE_SSL", "False").lower() == "true"
+# Seconds before a stalled SMTP connect/send fails instead of pinning the worker
+EMAIL_TIMEOUT = int(os.environ.get("EMAIL_TIMEOUT", "10"))
 DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "noreply@ambacar.com")
 
 # =============================================================================
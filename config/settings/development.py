@@ -1,6 +1,8 @@
 """
 Development settings for Ambacar Notification Service.
 """
+import os
+
 from .base import *  # noqa: F401, F403
 
 DEBUG = True
@@ -13,15 +15,22 @@ CORS_ALLOW_ALL_ORIGINS = True
 # Email - use console backend in development
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
-# Add debug toolbar
-INSTALLED_APPS += ["debug_toolbar"]  # noqa: F405
-MIDDLEWARE.insert(0, "debug_toolbar.middleware.DebugToolbarMiddleware")  # noqa: F405
+# Debug toolbar (opt-in: it instruments every request)
+ENABLE_DEBUG_TOOLBAR = os.environ.get("ENABLE_DEBUG_TOOLBAR", "").lower() == "true"
+if ENABLE_DEBUG_TOOLBAR:
+    INSTALLED_APPS += ("debug_toolbar",)  # noqa: F405
+    MIDDLEWARE = ("debug_toolbar.middleware.DebugToolbarMiddleware",) + MIDDLEWARE  # noqa: F405
+    INTERNAL_IPS = ["127.0.0.1"]
 
-INTERNAL_IPS = ["127.0.0.1"]
+# Static files - runserver serves them from the apps, no collectstatic manifest
+if SERVE_STATIC:  # noqa: F405
+    STORAGES["staticfiles"]["BACKEND"] = (  # noqa: F405
+        "django.contrib.staticfiles.storage.StaticFilesStorage"
+    )
 
 # REST Framework - add browsable API in development
 REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [  # noqa: F405
-    "rest_framework.renderers.JSONRenderer",
+    "apps.core.renderers.ORJSONRenderer",
     "rest_framework.renderers.BrowsableAPIRenderer",
 ]
 
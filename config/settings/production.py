@@ -18,6 +18,9 @@ SECURE_HSTS_PRELOAD = True
 # SESSION_COOKIE_SECURE = True
 # CSRF_COOKIE_SECURE = True
 
+# Schema warnings are for development; don't log them on each generation
+SPECTACULAR_SETTINGS["DISABLE_ERRORS_AND_WARNINGS"] = True  # noqa: F405
+
 # Logging
 LOGGING = {
     "version": 1,
@@ -1,18 +1,29 @@
 """
 URL configuration for Ambacar Notification Service.
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
 
-urlpatterns = [
-    # Admin
-    path("admin/", admin.site.urls),
+# The OpenAPI schema only changes with a deploy: outside DEBUG, cache the
+# generated document (per Accept header: YAML vs JSON) instead of introspecting
+# every view and serializer on each docs page load
+SCHEMA_CACHE_TTL = 60 * 60
+
+schema_view = SpectacularAPIView.as_view()
+if not settings.DEBUG:
+    schema_view = cache_page(SCHEMA_CACHE_TTL, key_prefix="openapi")(
+        vary_on_headers("Accept")(schema_view)
+    )
 
+urlpatterns = (
     # Public API v1
     path("api/v1/", include([
         path("notifications/", include("apps.notifications.urls")),
@@ -24,7 +35,7 @@ urlpatterns = [
     path("api/internal/v1/", include("apps.synchronization.urls")),
 
     # OpenAPI Schema
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", schema_view, name="schema"),
 
     # Swagger UI
     path(
@@ -39,16 +50,14 @@ urlpatterns = [
         SpectacularRedocView.as_view(url_name="schema"),
         name="redoc"
     ),
-]
+)
 
-# Add debug toolbar in development
-from django.conf import settings
+# Admin (needs sessions, see ENABLE_SESSIONS)
+if settings.ENABLE_SESSIONS:
+    urlpatterns = (path("admin/", admin.site.urls),) + urlpatterns
 
-if settings.DEBUG:
-    try:
-        import debug_toolbar
-        urlpatterns = [
-            path("__debug__/", include(debug_toolbar.urls)),
-        ] + urlpatterns
-    except ImportError:
-        pass
+# Add debug toolbar in development (ENABLE_DEBUG_TOOLBAR, see development settings)
+if settings.DEBUG and getattr(settings, "ENABLE_DEBUG_TOOLBAR", False):
+    urlpatterns = (
+        path("__debug__/", include("debug_toolbar.urls")),
+    ) + urlpatterns
@@ -6,7 +6,17 @@ It exposes the WSGI callable as a module-level variable named ``application``.
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 
 application = get_wsgi_application()
+
+
+def _warm_urlconf():
+    """Warm the URLconf: import views, serializers and DRF parser/renderer classes."""
+    get_resolver().url_patterns
+
+
+# At worker boot, so the first request doesn't pay for these imports
+_warm_urlconf()
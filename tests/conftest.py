@@ -9,7 +9,6 @@ import sys
 
 import django
 import pytest
-from django.conf import settings
 
 # Asegurar que el directorio del proyecto esté en el path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -17,18 +16,65 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 def pytest_configure():
     """Configurar Django antes de ejecutar los tests."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+    # Base de datos, caché y Celery de los tests: config/settings/test.py
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.test')
     os.environ.setdefault('SECRET_KEY', 'test-secret-key-for-pytest')
-    os.environ.setdefault('DATABASE_URL', 'sqlite:///test_db.sqlite3')
     os.environ.setdefault('REDIS_URL', 'redis://localhost:6379/0')
 
     django.setup()
 
 
-@pytest.fixture(scope='session')
-def django_db_setup():
-    """Configurar la base de datos para los tests."""
-    pass
+def _postgres_unavailable():
+    """
+    Motivo por el que no se puede conectar al PostgreSQL de los tests, o None.
+
+    Se conecta a la base "postgres" del servidor (pytest-django crea ahí la
+    base test_<name>), con un timeout corto.
+    """
+    import psycopg
+    from django.db import connection
+
+    params = connection.get_connection_params()
+    params.pop('cursor_factory', None)
+    params.update(dbname='postgres', connect_timeout=3)
+    try:
+        psycopg.connect(**params).close()
+    except psycopg.Error as exc:
+        return str(exc).strip().splitlines()[0]
+    return None
+
+
+def _uses_database(item):
+    from django.test import TransactionTestCase
+
+    cls = getattr(item, 'cls', None)
+    return item.get_closest_marker('django_db') is not None or (
+        cls is not None and issubclass(cls, TransactionTestCase)
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Omitir los tests con base de datos si PostgreSQL no está disponible.
+
+    Los modelos usan ArrayField y los syncs upserts ON CONFLICT, así que no
+    hay alternativa en SQLite: sin servidor (TEST_DATABASE_URL) se ejecutan
+    solo los tests sin base de datos. En CI (variable CI) no se omiten: una
+    base inaccesible debe fallar el pipeline.
+    """
+    if os.environ.get('CI'):
+        return
+    db_items = [item for item in items if _uses_database(item)]
+    if not db_items:
+        return
+    reason = _postgres_unavailable()
+    if reason is None:
+        return
+    skip = pytest.mark.skip(
+        reason=f'PostgreSQL no disponible (TEST_DATABASE_URL): {reason}'
+    )
+    for item in db_items:
+        item.add_marker(skip)
 
 
 @pytest.fixture
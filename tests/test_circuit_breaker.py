@@ -0,0 +1,194 @@
+"""
+Tests del circuit breaker de base de datos de la sincronización.
+"""
+
+import threading
+from unittest import mock
+
+import psycopg.errors
+from django.core.cache import cache
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+from apps.core.exceptions import DatabaseCircuitOpenError
+from apps.notifications.models import ServicePhase, Vehicle
+from apps.synchronization import circuit_breaker
+from apps.synchronization.circuit_breaker import (
+    DB_BREAKER_FAILURE_THRESHOLD,
+    _FAILURES_KEY,
+    _OPEN_KEY,
+    db_circuit_breaker,
+    db_circuit_is_open,
+)
+from apps.synchronization.tasks import sync_vehicle_phases_task
+
+
+def _operational_error(cause):
+    """OperationalError de Django envolviendo el error del driver, como en producción."""
+    try:
+        raise OperationalError(str(cause)) from cause
+    except OperationalError as exc:
+        return exc
+
+
+def _fail_inside_breaker(exc):
+    try:
+        with db_circuit_breaker():
+            raise exc
+    except type(exc):
+        pass
+
+
+def _reset_breaker(test):
+    """Limpiar Redis (LocMem) y desactivar el estado cacheado en el proceso."""
+    cache.clear()
+    patcher = mock.patch.multiple(
+        circuit_breaker, DB_BREAKER_STATE_CACHE_SECONDS=0, _state=(0.0, False, False)
+    )
+    patcher.start()
+    test.addCleanup(patcher.stop)
+
+
+class TestCircuitBreaker(TestCase):
+    """Transiciones CLOSED -> OPEN -> HALF_OPEN -> CLOSED."""
+
+    def setUp(self):
+        _reset_breaker(self)
+        self.failure = _operational_error(psycopg.errors.ConnectionTimeout("timeout"))
+
+    def trip(self):
+        for _ in range(DB_BREAKER_FAILURE_THRESHOLD):
+            _fail_inside_breaker(self.failure)
+
+    def expire_open_key(self):
+        """Simular que pasó DB_BREAKER_RECOVERY_TIMEOUT."""
+        cache.delete(_OPEN_KEY)
+
+    def test_opens_after_the_threshold(self):
+        """El umbral de fallos abre el circuito y las operaciones fallan sin tocar la BD."""
+        for _ in range(DB_BREAKER_FAILURE_THRESHOLD - 1):
+            _fail_inside_breaker(self.failure)
+        assert not db_circuit_is_open()
+
+        _fail_inside_breaker(self.failure)
+
+        assert db_circuit_is_open()
+        block = mock.Mock()
+        with self.assertRaises(DatabaseCircuitOpenError):
+            with db_circuit_breaker():
+                block()
+        block.assert_not_called()
+
+    def test_half_open_failure_reopens(self):
+        """En HALF_OPEN un solo fallo vuelve a abrir el circuito."""
+        self.trip()
+        self.expire_open_key()
+        assert not db_circuit_is_open()
+
+        _fail_inside_breaker(self.failure)
+
+        assert db_circuit_is_open()
+
+    def test_success_after_recovery_closes_the_circuit(self):
+        """La primera operación exitosa tras el timeout reinicia el contador."""
+        self.trip()
+        self.expire_open_key()
+
+        with db_circuit_breaker():
+            pass
+
+        assert cache.get(_FAILURES_KEY) is None
+        for _ in range(DB_BREAKER_FAILURE_THRESHOLD - 1):
+            _fail_inside_breaker(self.failure)
+        assert not db_circuit_is_open()
+
+    def test_fails_open_when_redis_is_down(self):
+        """Sin Redis el breaker no bloquea ni rompe las operaciones."""
+        block = mock.Mock()
+        down = ConnectionError("redis down")
+
+        with mock.patch.multiple(
+            cache, get_many=mock.Mock(side_effect=down), incr=mock.Mock(side_effect=down)
+        ):
+            assert not db_circuit_is_open()
+            with db_circuit_breaker():
+                block()
+            _fail_inside_breaker(self.failure)
+
+        block.assert_called_once()
+
+    def test_state_is_cached_in_process(self):
+        """Dentro de DB_BREAKER_STATE_CACHE_SECONDS no se vuelve a consultar Redis."""
+        with mock.patch.object(circuit_breaker, "DB_BREAKER_STATE_CACHE_SECONDS", 60):
+            with mock.patch.object(cache, "get_many", return_value={}) as get_many:
+                for _ in range(5):
+                    with db_circuit_breaker():
+                        pass
+
+        get_many.assert_called_once()
+
+
+class TestLockContention(TestCase):
+    """Un lock ocupado (NOWAIT) no es una caída de la base de datos."""
+
+    def setUp(self):
+        _reset_breaker(self)
+
+    def test_lock_not_available_is_not_counted(self):
+        """LockNotAvailable no suma fallos ni abre el circuito."""
+        exc = _operational_error(psycopg.errors.LockNotAvailable("row is locked"))
+
+        for _ in range(DB_BREAKER_FAILURE_THRESHOLD + 1):
+            _fail_inside_breaker(exc)
+
+        assert cache.get(_FAILURES_KEY) is None
+        assert not db_circuit_is_open()
+
+    def test_connection_errors_are_counted(self):
+        """Otros OperationalError sí cuentan como fallo."""
+        exc = _operational_error(psycopg.errors.ConnectionTimeout("timeout"))
+
+        _fail_inside_breaker(exc)
+
+        assert cache.get(_FAILURES_KEY) == 1
+
+
+class TestVehiclePhasesLock(TransactionTestCase):
+    """sync_vehicle_phases_task con la fila del vehículo bloqueada por otro sync."""
+
+    def setUp(self):
+        _reset_breaker(self)
+        Vehicle.objects.create(
+            customer_id="CUST-1", brand="Toyota", model="Corolla", year=2020, plate="ABC-1"
+        )
+        ServicePhase.objects.create(slug="phase-a", name="A", icon="Calendar", order=1)
+
+    def test_locked_vehicle_fails_fast_without_tripping_the_breaker(self):
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    Vehicle.objects.select_for_update().get(plate="ABC-1")
+                    locked.set()
+                    release.wait(timeout=10)
+            finally:
+                connection.close()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        try:
+            assert locked.wait(timeout=10)
+            sync_data = {
+                "plate": "ABC-1",
+                "sync_mode": "full",
+                "phases": [{"phase_slug": "phase-a", "order": 1}],
+            }
+            with self.assertRaises(OperationalError):
+                sync_vehicle_phases_task(sync_data)
+        finally:
+            release.set()
+            holder.join()
+
+        assert cache.get(_FAILURES_KEY) is None
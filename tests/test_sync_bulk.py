@@ -0,0 +1,155 @@
+"""
+Tests de los webhooks y tareas de sincronización en lote (bulk).
+"""
+
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.notifications.models import CustomerContactInfo, Vehicle
+from apps.synchronization.schemas import SYNC_BULK_MAX_ITEMS
+from apps.synchronization.tasks import (
+    sync_customers_bulk_task,
+    sync_queue_for,
+    sync_vehicles_bulk_task,
+)
+
+
+def _customer(customer_id, **fields):
+    return {"customer_id": customer_id, "first_name": "Juan", **fields}
+
+
+def _vehicle(plate, **fields):
+    return {
+        "vehicle_id": f"VEH-{plate}",
+        "customer_id": "CUST-1",
+        "plate": plate,
+        "brand": "Toyota",
+        "model": "Corolla",
+        "year": 2020,
+        **fields,
+    }
+
+
+class TestBulkSyncEndpoints(TestCase):
+    """Tests de /customers/sync/bulk/ y /vehicles/sync/bulk/."""
+
+    def setUp(self):
+        cache.clear()
+        self.headers = {"HTTP_X_INTERNAL_SECRET": settings.INTERNAL_API_SECRET_KEY}
+
+    def post(self, url, payload):
+        return self.client.post(
+            url, payload, content_type="application/json", **self.headers
+        )
+
+    def test_customers_bulk_creates_and_updates(self):
+        """Un lote crea los clientes nuevos y actualiza los existentes."""
+        CustomerContactInfo.objects.create(customer_id="CUST-1", first_name="Viejo")
+
+        response = self.post(
+            "/api/internal/v1/customers/sync/bulk/",
+            [_customer("CUST-1", last_name="Pérez"), _customer("CUST-2")],
+        )
+
+        assert response.status_code == 202
+        assert response.json()["count"] == 2
+        assert len(response.json()["task_ids"]) == 1
+        customer = CustomerContactInfo.objects.get(customer_id="CUST-1")
+        assert (customer.first_name, customer.last_name) == ("Juan", "Pérez")
+        assert CustomerContactInfo.objects.filter(customer_id="CUST-2").exists()
+
+    def test_vehicles_bulk_creates_vehicles(self):
+        """Un lote de vehículos se sincroniza por placa."""
+        response = self.post(
+            "/api/internal/v1/vehicles/sync/bulk/", [_vehicle("AAA-1"), _vehicle("BBB-2")]
+        )
+
+        assert response.status_code == 202
+        assert set(Vehicle.objects.values_list("plate", flat=True)) == {"AAA-1", "BBB-2"}
+
+    def test_empty_list_is_rejected(self):
+        """Una lista vacía es un payload inválido, no un 202 sin tareas."""
+        response = self.post("/api/internal/v1/customers/sync/bulk/", [])
+
+        assert response.status_code == 400
+
+    def test_too_many_items_are_rejected(self):
+        """Más de SYNC_BULK_MAX_ITEMS registros se rechazan."""
+        customers = [_customer(f"CUST-{i}") for i in range(SYNC_BULK_MAX_ITEMS + 1)]
+
+        with mock.patch("apps.synchronization.views.dispatch") as dispatch:
+            response = self.post("/api/internal/v1/customers/sync/bulk/", customers)
+
+        assert response.status_code == 400
+        dispatch.assert_not_called()
+
+    def test_invalid_item_is_rejected(self):
+        """Un item inválido rechaza todo el lote."""
+        response = self.post(
+            "/api/internal/v1/vehicles/sync/bulk/", [_vehicle("AAA-1"), {"plate": "X"}]
+        )
+
+        assert response.status_code == 400
+        assert not Vehicle.objects.exists()
+
+    @override_settings(SYNC_SHARDS=4)
+    def test_chunks_follow_the_entity_sync_queue(self):
+        """Cada lote va a la cola sync.<n> de sus entidades, como el sync individual."""
+        vehicles = [_vehicle(f"PLT-{i}") for i in range(20)]
+
+        with mock.patch(
+            "apps.synchronization.views.dispatch", return_value="task-id"
+        ) as dispatch:
+            response = self.post("/api/internal/v1/vehicles/sync/bulk/", vehicles)
+
+        assert response.status_code == 202
+        assert len(response.json()["task_ids"]) == dispatch.call_count
+        dispatched = 0
+        for call in dispatch.call_args_list:
+            (chunk,) = call.args[1]
+            assert {sync_queue_for(v["plate"]) for v in chunk} == {call.kwargs["queue"]}
+            dispatched += len(chunk)
+        assert dispatched == len(vehicles)
+
+    def test_rejects_invalid_internal_secret(self):
+        """Un X-Internal-Secret incorrecto responde 401."""
+        response = self.client.post(
+            "/api/internal/v1/customers/sync/bulk/",
+            [_customer("CUST-1")],
+            content_type="application/json",
+            HTTP_X_INTERNAL_SECRET="wrong-secret",
+        )
+
+        assert response.status_code == 401
+
+
+class TestBulkSyncTasks(TestCase):
+    """Tests de las tareas bulk (bulk_create + bulk_update)."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_customers_bulk_does_not_overwrite_with_null(self):
+        """Los campos que llegan en null conservan el valor local."""
+        CustomerContactInfo.objects.create(
+            customer_id="CUST-1", first_name="Juan", email="juan@example.com"
+        )
+
+        result = sync_customers_bulk_task([_customer("CUST-1", email=None, sync_version=3)])
+
+        assert result == {"status": "success", "created": 0, "updated": 1}
+        customer = CustomerContactInfo.objects.get(customer_id="CUST-1")
+        assert customer.email == "juan@example.com"
+        assert customer.sync_version == 3
+
+    def test_vehicles_bulk_deduplicates_by_plate(self):
+        """Si una placa se repite en el lote, gana el último payload."""
+        result = sync_vehicles_bulk_task(
+            [_vehicle("AAA-1", current_kilometers=100), _vehicle("AAA-1", current_kilometers=200)]
+        )
+
+        assert result == {"status": "success", "created": 1, "updated": 0}
+        assert Vehicle.objects.get(plate="AAA-1").current_kilometers == 200
@@ -0,0 +1,126 @@
+"""
+Tests del despacho en lotes de las tareas de sync (dispatch.py).
+"""
+
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from kombu.exceptions import OperationalError as BrokerError
+
+from apps.synchronization import dispatch as dispatch_module
+from apps.synchronization.dispatch import dispatch, flush
+from apps.synchronization.tasks import sync_global_phases_task, sync_vehicle_phases_task
+
+
+def _task():
+    """Tarea falsa: apply_async devuelve un resultado con el task_id recibido."""
+    task = mock.MagicMock(name="sync_task")
+    task.apply_async.side_effect = lambda **kwargs: mock.Mock(id=kwargs["task_id"])
+    return task
+
+
+class TestDispatch(SimpleTestCase):
+    """dispatch() y flush() con y sin SYNC_BATCH_MS."""
+
+    def setUp(self):
+        dispatch_module._pending.clear()
+        patcher = mock.patch.object(dispatch_module, "_ensure_flusher")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(dispatch_module._pending.clear)
+
+    @override_settings(SYNC_BATCH_MS=0)
+    def test_publishes_immediately_without_batching(self):
+        task = _task()
+
+        task_id = dispatch(task, [{"id": 1}], queue="sync.0", task_id="t-1")
+
+        assert task_id == "t-1"
+        task.apply_async.assert_called_once_with(
+            args=[{"id": 1}], queue="sync.0", task_id="t-1"
+        )
+        assert not dispatch_module._pending
+
+    @override_settings(SYNC_BATCH_MS=50)
+    def test_flush_publishes_the_batch_with_one_producer(self):
+        task = _task()
+        producer = task.app.producer_or_acquire.return_value.__enter__.return_value
+
+        task_ids = [dispatch(task, [{"id": i}], queue="sync.0") for i in range(3)]
+        task.apply_async.assert_not_called()
+        flush()
+
+        assert [c.kwargs["task_id"] for c in task.apply_async.call_args_list] == task_ids
+        assert all(c.kwargs["producer"] is producer for c in task.apply_async.call_args_list)
+        task.app.producer_or_acquire.assert_called_once()
+        assert not dispatch_module._pending
+
+    @override_settings(SYNC_BATCH_MS=50)
+    def test_failed_producer_publishes_the_rest_one_by_one(self):
+        """Un fallo a mitad del lote no descarta los mensajes pendientes."""
+        task = _task()
+        calls = []
+
+        def apply_async(**kwargs):
+            calls.append(kwargs)
+            if kwargs.get("producer") is not None and len(calls) == 2:
+                raise BrokerError("connection reset")
+            return mock.Mock(id=kwargs["task_id"])
+
+        task.apply_async.side_effect = apply_async
+        for i in range(3):
+            dispatch(task, [{"id": i}], task_id=f"t-{i}")
+
+        flush()
+
+        retried = [c["task_id"] for c in calls if "producer" not in c]
+        assert retried == ["t-1", "t-2"]
+        assert [c["task_id"] for c in calls].count("t-0") == 1
+
+    @override_settings(SYNC_BATCH_MS=50)
+    def test_lost_messages_are_logged_and_release_their_key(self):
+        """Si el broker tampoco acepta el reintento, se registra y se libera la clave."""
+        cache.set("sync:veh:ABC-1:7", "t-1")
+        task = _task()
+        task.apply_async.side_effect = BrokerError("broker down")
+        dispatch(task, [{"id": 1}], task_id="t-1", idem_key="sync:veh:ABC-1:7")
+
+        with self.assertLogs("apps.synchronization.dispatch", level="ERROR") as logs:
+            flush()
+
+        assert "t-1" in "\n".join(logs.output)
+        assert cache.get("sync:veh:ABC-1:7") is None
+        assert not dispatch_module._pending
+
+
+class TestPhasesDispatch(TestCase):
+    """Los syncs de fases se despachan igual que los de cliente y vehículo."""
+
+    def setUp(self):
+        cache.clear()
+        self.headers = {"HTTP_X_INTERNAL_SECRET": settings.INTERNAL_API_SECRET_KEY}
+
+    def test_phase_syncs_go_through_dispatch(self):
+        payloads = {
+            "/api/internal/v1/phases/sync/": {
+                "phases": [{"slug": "phase-a", "name": "A", "icon": "Calendar", "order": 1}],
+                "sync_version": 1,
+            },
+            "/api/internal/v1/vehicles/ABC-1/phases/sync/": {
+                "phases": [{"phase_slug": "phase-a", "order": 1}],
+                "sync_version": 1,
+            },
+        }
+
+        with mock.patch("apps.synchronization.views.dispatch") as dispatch:
+            for url, payload in payloads.items():
+                response = self.client.post(
+                    url, payload, content_type="application/json", **self.headers
+                )
+                assert response.status_code == 202
+
+        tasks = [call.args[0] for call in dispatch.call_args_list]
+        assert tasks == [sync_global_phases_task, sync_vehicle_phases_task]
+        assert all(call.kwargs["idem_key"] for call in dispatch.call_args_list)
@@ -0,0 +1,129 @@
+"""
+Tests de la idempotencia de los webhooks de sincronización (reintentos de Core).
+"""
+
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from kombu.exceptions import OperationalError as BrokerError
+
+from apps.notifications.models import CustomerContactInfo
+
+
+class TestSyncIdempotency(TestCase):
+    """Un reintento de la misma versión no encola otra tarea."""
+
+    def setUp(self):
+        cache.clear()
+        self.headers = {"HTTP_X_INTERNAL_SECRET": settings.INTERNAL_API_SECRET_KEY}
+
+    def post(self, url, payload):
+        return self.client.post(
+            url, payload, content_type="application/json", **self.headers
+        )
+
+    def test_retry_returns_the_original_task_id(self):
+        """La segunda entrega de una versión responde duplicate con el task_id original."""
+        payload = {"customer_id": "CUST-1", "first_name": "Juan", "sync_version": 1}
+
+        first = self.post("/api/internal/v1/customers/sync/", payload)
+        with mock.patch("apps.synchronization.views.dispatch") as dispatch:
+            second = self.post("/api/internal/v1/customers/sync/", payload)
+
+        assert first.status_code == 202
+        assert second.status_code == 202
+        assert second.json()["status"] == "duplicate"
+        assert second.json()["task_id"] == first.json()["task_id"]
+        dispatch.assert_not_called()
+
+    def test_new_version_is_processed(self):
+        """Otra sync_version del mismo cliente no es un reintento."""
+        self.post(
+            "/api/internal/v1/customers/sync/",
+            {"customer_id": "CUST-1", "first_name": "Juan", "sync_version": 1},
+        )
+        response = self.post(
+            "/api/internal/v1/customers/sync/",
+            {"customer_id": "CUST-1", "first_name": "Pedro", "sync_version": 2},
+        )
+
+        assert response.json()["status"] == "accepted"
+        assert CustomerContactInfo.objects.get(customer_id="CUST-1").first_name == "Pedro"
+
+    def test_without_version_every_delivery_is_processed(self):
+        """Sin sync_version no se puede distinguir un reintento: siempre se encola."""
+        payload = {"customer_id": "CUST-1", "first_name": "Juan"}
+
+        with mock.patch(
+            "apps.synchronization.views.dispatch", return_value="task-id"
+        ) as dispatch:
+            self.post("/api/internal/v1/customers/sync/", payload)
+            self.post("/api/internal/v1/customers/sync/", payload)
+
+        assert dispatch.call_count == 2
+
+    def test_failed_enqueue_releases_the_key(self):
+        """Si el broker falla, el reintento de Core se encola en lugar de darse por duplicado."""
+        payload = {
+            "vehicle_id": "VEH-1",
+            "customer_id": "CUST-1",
+            "plate": "ABC-1",
+            "brand": "Toyota",
+            "model": "Corolla",
+            "year": 2020,
+            "sync_version": 7,
+        }
+
+        with mock.patch(
+            "apps.synchronization.views.dispatch", side_effect=BrokerError("down")
+        ):
+            with self.assertRaises(BrokerError):
+                self.post("/api/internal/v1/vehicles/sync/", payload)
+
+        with mock.patch(
+            "apps.synchronization.views.dispatch", return_value="task-id"
+        ) as dispatch:
+            response = self.post("/api/internal/v1/vehicles/sync/", payload)
+
+        assert response.json()["status"] == "accepted"
+        dispatch.assert_called_once()
+
+    def test_failed_phases_enqueue_releases_the_key(self):
+        """Lo mismo aplica a los syncs de fases."""
+        payload = {
+            "sync_mode": "partial",
+            "phases": [{"slug": "phase-a", "name": "A", "icon": "Calendar", "order": 1}],
+            "sync_version": 3,
+        }
+
+        with mock.patch(
+            "apps.synchronization.views.dispatch", side_effect=BrokerError("down")
+        ):
+            with self.assertRaises(BrokerError):
+                self.post("/api/internal/v1/phases/sync/", payload)
+
+        with mock.patch("apps.synchronization.views.dispatch") as dispatch:
+            response = self.post("/api/internal/v1/phases/sync/", payload)
+
+        assert response.json()["status"] == "accepted"
+        dispatch.assert_called_once()
+
+    def test_phases_key_includes_the_content(self):
+        """La misma versión de fases con otro contenido no es un reintento."""
+        payload = {
+            "sync_mode": "partial",
+            "phases": [{"slug": "phase-a", "name": "A", "icon": "Calendar", "order": 1}],
+            "sync_version": 3,
+        }
+
+        with mock.patch("apps.synchronization.views.dispatch") as dispatch:
+            self.post("/api/internal/v1/phases/sync/", payload)
+            retry = self.post("/api/internal/v1/phases/sync/", payload)
+            payload["phases"][0]["name"] = "B"
+            changed = self.post("/api/internal/v1/phases/sync/", payload)
+
+        assert retry.json()["status"] == "duplicate"
+        assert changed.json()["status"] == "accepted"
+        assert dispatch.call_count == 2
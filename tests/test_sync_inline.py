@@ -0,0 +1,186 @@
+"""
+Tests de la sincronización inline cuando la cola de sync está ociosa.
+"""
+
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from kombu.exceptions import ChannelError
+
+from apps.notifications.models import CustomerContactInfo, Vehicle
+from apps.synchronization.dispatch import IN_FLIGHT_KEY, dispatch
+from apps.synchronization.signals import sync_task_finished
+from apps.synchronization.tasks import sync_customer_task
+from apps.synchronization.views import _sync_queue_idle
+
+
+def _patch_broker(test, driver_type="redis", length=0):
+    """
+    Sustituir la conexión de lectura al broker por un doble.
+
+    Con Redis el largo de la cola sale de LLEN sobre la lista (0 si la clave
+    no existe); con otros transportes, de un queue_declare pasivo.
+    """
+    connection = mock.MagicMock()
+    conn = connection.__enter__.return_value
+    conn.transport.driver_type = driver_type
+    conn.default_channel.client.llen.return_value = length
+    conn.default_channel.queue_declare.return_value.message_count = length
+    if driver_type == "redis" and length == 0:
+        # Como kombu: la lista no existe y el declare pasivo falla
+        conn.default_channel.queue_declare.side_effect = ChannelError("NOT_FOUND")
+    patcher = mock.patch.object(
+        sync_customer_task.app, "connection_for_read", return_value=connection
+    )
+    patcher.start()
+    test.addCleanup(patcher.stop)
+    return conn
+
+
+@override_settings(SYNC_INLINE_WHEN_IDLE=True)
+class TestSyncQueueIdle(TestCase):
+    """_sync_queue_idle() contra un broker simulado."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_empty_redis_queue_is_idle(self):
+        """Redis borra las listas vacías: LLEN de una cola sin clave devuelve 0."""
+        conn = _patch_broker(self, length=0)
+
+        assert _sync_queue_idle("sync.1") is True
+        conn.default_channel.client.llen.assert_called_once_with("sync.1")
+
+    def test_redis_queue_with_backlog_is_busy_and_cached(self):
+        conn = _patch_broker(self, length=3)
+
+        assert _sync_queue_idle("sync.1") is False
+        assert _sync_queue_idle("sync.1") is False
+        assert conn.default_channel.client.llen.call_count == 1
+
+    def test_other_transports_use_a_passive_declare(self):
+        conn = _patch_broker(self, driver_type="amqp", length=0)
+
+        assert _sync_queue_idle("sync") is True
+        conn.default_channel.queue_declare.assert_called_once_with(
+            queue="sync", passive=True
+        )
+
+    def test_tasks_in_flight_keep_the_queue_busy(self):
+        """Un mensaje ya reservado por un worker no está en la lista, pero sí en curso."""
+        conn = _patch_broker(self, length=0)
+        cache.set(IN_FLIGHT_KEY.format("sync.1"), 1)
+
+        assert _sync_queue_idle("sync.1") is False
+        conn.default_channel.client.llen.assert_not_called()
+
+    def test_broker_error_is_busy(self):
+        with mock.patch.object(
+            sync_customer_task.app, "connection_for_read", side_effect=OSError("down")
+        ):
+            assert _sync_queue_idle("sync") is False
+
+
+@override_settings(SYNC_INLINE_WHEN_IDLE=True)
+class TestInFlightCounter(TestCase):
+    """dispatch() cuenta la tarea en curso y task_postrun la descuenta al terminar."""
+
+    def setUp(self):
+        cache.clear()
+        self.key = IN_FLIGHT_KEY.format("sync.2")
+
+    def finish(self, state):
+        task = mock.Mock(request=mock.Mock(delivery_info={"routing_key": "sync.2"}))
+        task.name = sync_customer_task.name
+        sync_task_finished(sender=task, state=state)
+
+    def test_dispatch_marks_and_postrun_finishes(self):
+        with mock.patch.object(sync_customer_task, "apply_async"):
+            dispatch(sync_customer_task, [{}], queue="sync.2")
+            dispatch(sync_customer_task, [{}], queue="sync.2")
+        assert cache.get(self.key) == 2
+
+        self.finish("SUCCESS")
+        self.finish("FAILURE")
+
+        assert cache.get(self.key) is None
+
+    def test_retry_stays_in_flight(self):
+        with mock.patch.object(sync_customer_task, "apply_async"):
+            dispatch(sync_customer_task, [{}], queue="sync.2")
+
+        self.finish("RETRY")
+
+        assert cache.get(self.key) == 1
+
+
+@override_settings(SYNC_INLINE_WHEN_IDLE=True)
+class TestInlineSync(TestCase):
+    """SYNC_INLINE_WHEN_IDLE con la cola sin backlog."""
+
+    def setUp(self):
+        cache.clear()
+        self.headers = {"HTTP_X_INTERNAL_SECRET": settings.INTERNAL_API_SECRET_KEY}
+        _patch_broker(self, length=0)
+        self.payload = {"customer_id": "CUST-1", "first_name": "Juan", "sync_version": 1}
+
+    def post(self, url, payload):
+        return self.client.post(
+            url, payload, content_type="application/json", **self.headers
+        )
+
+    def test_syncs_in_the_request(self):
+        """Responde 200 con el resultado y un reintento se da por duplicado sin task_id."""
+        with mock.patch("apps.synchronization.views.dispatch") as dispatch:
+            response = self.post("/api/internal/v1/customers/sync/", self.payload)
+            retry = self.post("/api/internal/v1/customers/sync/", self.payload)
+
+        assert response.status_code == 200
+        assert response.json()["action"] == "upserted"
+        assert CustomerContactInfo.objects.filter(customer_id="CUST-1").exists()
+        assert retry.json()["status"] == "duplicate"
+        assert retry.json()["task_id"] is None
+        dispatch.assert_not_called()
+
+    def test_vehicle_syncs_in_the_request(self):
+        payload = {
+            "vehicle_id": "VEH-1",
+            "customer_id": "CUST-1",
+            "plate": "ABC-1",
+            "brand": "Toyota",
+            "model": "Corolla",
+            "year": 2020,
+        }
+
+        response = self.post("/api/internal/v1/vehicles/sync/", payload)
+
+        assert response.status_code == 200
+        assert Vehicle.objects.filter(plate="ABC-1").exists()
+
+    def test_inline_error_releases_the_key(self):
+        """Si la sync inline falla, el reintento de Core se procesa."""
+        with mock.patch(
+            "apps.synchronization.views.sync_customer", side_effect=ValueError("boom")
+        ):
+            with self.assertRaises(ValueError):
+                self.post("/api/internal/v1/customers/sync/", self.payload)
+
+        response = self.post("/api/internal/v1/customers/sync/", self.payload)
+
+        assert response.status_code == 200
+        assert response.json()["action"] == "upserted"
+
+    def test_database_error_falls_back_to_celery(self):
+        """Un OperationalError inline encola la tarea, que sí reintenta."""
+        with mock.patch(
+            "apps.synchronization.views.sync_customer",
+            side_effect=OperationalError("connection lost"),
+        ):
+            response = self.post("/api/internal/v1/customers/sync/", self.payload)
+
+        assert response.status_code == 202
+        assert response.json()["task_id"]
+        assert CustomerContactInfo.objects.filter(customer_id="CUST-1").exists()
@@ -0,0 +1,140 @@
+"""
+Tests de los JSON Schemas compilados de los webhooks de sincronización.
+"""
+
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from fastjsonschema import JsonSchemaValueException
+
+from apps.synchronization.schemas import (
+    validate_customer,
+    validate_global_phases,
+    validate_vehicle,
+    validate_vehicle_phases,
+)
+
+CUSTOMER = {"customer_id": "CUST-1", "first_name": "Juan"}
+
+VEHICLE = {
+    "vehicle_id": "VEH-1",
+    "customer_id": "CUST-1",
+    "plate": "ABC-1",
+    "brand": "Toyota",
+    "model": "Corolla",
+}
+
+
+def _global_phase(slug, order):
+    return {"slug": slug, "name": "Fase", "icon": "Calendar", "order": order}
+
+
+class TestSyncSchemas:
+    """Validación y normalización de los payloads."""
+
+    def test_valid_payloads_get_defaults(self):
+        customer = validate_customer(CUSTOMER)
+        vehicle = validate_vehicle(VEHICLE)
+        phases = validate_global_phases({"phases": [_global_phase("phase-a", 1)]})
+
+        assert customer["last_name"] == ""
+        assert vehicle["current_kilometers"] == 0
+        assert phases["sync_mode"] == "partial"
+        assert phases["phases"][0]["is_active"] is True
+
+    @pytest.mark.parametrize("field", ["customer_id", "first_name"])
+    def test_missing_required_field(self, field):
+        payload = {k: v for k, v in CUSTOMER.items() if k != field}
+
+        with pytest.raises(JsonSchemaValueException, match=field):
+            validate_customer(payload)
+
+    def test_unknown_keys_are_dropped(self):
+        result = validate_vehicle({**VEHICLE, "owner": "x", "internal_flag": True})
+
+        assert "owner" not in result
+        assert "internal_flag" not in result
+
+    @pytest.mark.parametrize("field", ["customer_id", "first_name"])
+    def test_whitespace_only_required_string_is_rejected(self, field):
+        with pytest.raises(JsonSchemaValueException, match=field):
+            validate_customer({**CUSTOMER, field: "   "})
+
+    def test_strings_are_trimmed(self):
+        result = validate_customer({**CUSTOMER, "first_name": "  Juan "})
+
+        assert result["first_name"] == "Juan"
+
+    def test_integer_and_boolean_strings_are_coerced(self):
+        customer = validate_customer({**CUSTOMER, "sync_version": "3"})
+        vehicle = validate_vehicle({**VEHICLE, "year": "2020", "current_kilometers": 5.0})
+        phases = validate_vehicle_phases(
+            {"phases": [{"phase_slug": "phase-a", "order": "1", "is_active": "false"}]}
+        )
+
+        assert customer["sync_version"] == 3
+        assert (vehicle["year"], vehicle["current_kilometers"]) == (2020, 5)
+        assert phases["phases"][0] == {
+            "phase_slug": "phase-a",
+            "order": 1,
+            "is_active": False,
+        }
+
+    @pytest.mark.parametrize("value", ["3.5", "tres", True])
+    def test_non_integer_values_are_rejected(self, value):
+        with pytest.raises(JsonSchemaValueException, match="sync_version"):
+            validate_customer({**CUSTOMER, "sync_version": value})
+
+    def test_duplicate_phase_slugs_are_rejected(self):
+        payload = {"phases": [_global_phase("phase-a", 1), _global_phase("phase-a", 2)]}
+
+        with pytest.raises(JsonSchemaValueException, match="slug"):
+            validate_global_phases(payload)
+
+    def test_duplicate_phase_orders_are_rejected(self):
+        payload = {
+            "phases": [
+                {"phase_slug": "phase-a", "order": 1},
+                {"phase_slug": "phase-b", "order": "1"},
+            ]
+        }
+
+        with pytest.raises(JsonSchemaValueException, match="order"):
+            validate_vehicle_phases(payload)
+
+
+class TestSyncViewsValidation(TestCase):
+    """Respuestas de los webhooks ante payloads inválidos o con claves extra."""
+
+    def setUp(self):
+        cache.clear()
+        self.headers = {"HTTP_X_INTERNAL_SECRET": settings.INTERNAL_API_SECRET_KEY}
+
+    def post(self, url, payload):
+        return self.client.post(
+            url, payload, content_type="application/json", **self.headers
+        )
+
+    def test_invalid_payload_reports_the_first_error_by_field(self):
+        response = self.post(
+            "/api/internal/v1/customers/sync/", {"customer_id": "CUST-1", "first_name": " "}
+        )
+
+        assert response.status_code == 400
+        assert list(response.json()) == ["first_name"]
+
+    def test_body_plate_does_not_override_the_url_plate(self):
+        payload = {
+            "plate": "OTHER-1",
+            "phases": [{"phase_slug": "phase-a", "order": 1}],
+        }
+
+        with mock.patch("apps.synchronization.views.dispatch") as dispatch:
+            response = self.post("/api/internal/v1/vehicles/ABC-1/phases/sync/", payload)
+
+        assert response.status_code == 202
+        (task_data,) = dispatch.call_args.args[1]
+        assert task_data["plate"] == "ABC-1"
@@ -0,0 +1,74 @@
+"""
+Tests del reparto de los syncs entre colas sync.<n> (SYNC_SHARDS).
+"""
+
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.synchronization.tasks import sync_queue_for
+
+
+class TestSyncQueueFor(SimpleTestCase):
+    """sync_queue_for() según SYNC_SHARDS."""
+
+    @override_settings(SYNC_SHARDS=1)
+    def test_single_queue_without_shards(self):
+        assert sync_queue_for("CUST-1") == "sync"
+
+    @override_settings(SYNC_SHARDS=4)
+    def test_same_key_always_maps_to_the_same_shard(self):
+        queues = {sync_queue_for(f"PLT-{i}") for i in range(100)}
+
+        assert sync_queue_for("PLT-1") == sync_queue_for("PLT-1")
+        assert queues == {"sync.0", "sync.1", "sync.2", "sync.3"}
+
+
+@override_settings(SYNC_SHARDS=4)
+class TestShardedRouting(TestCase):
+    """Los webhooks de una entidad encolan en la cola de esa entidad."""
+
+    def setUp(self):
+        cache.clear()
+        self.headers = {"HTTP_X_INTERNAL_SECRET": settings.INTERNAL_API_SECRET_KEY}
+
+    def post(self, url, payload):
+        return self.client.post(
+            url, payload, content_type="application/json", **self.headers
+        )
+
+    def test_customer_sync_uses_the_customer_queue(self):
+        with mock.patch(
+            "apps.synchronization.views.dispatch", return_value="task-id"
+        ) as dispatch:
+            self.post(
+                "/api/internal/v1/customers/sync/",
+                {"customer_id": "CUST-7", "first_name": "Juan"},
+            )
+
+        assert dispatch.call_args.kwargs["queue"] == sync_queue_for("CUST-7")
+
+    def test_vehicle_and_phases_syncs_share_the_plate_queue(self):
+        """El sync del vehículo y el de sus fases nunca corren en paralelo."""
+        vehicle = {
+            "vehicle_id": "VEH-1",
+            "customer_id": "CUST-1",
+            "plate": "ABC-1",
+            "brand": "Toyota",
+            "model": "Corolla",
+            "year": 2020,
+        }
+
+        with mock.patch(
+            "apps.synchronization.views.dispatch", return_value="task-id"
+        ) as dispatch:
+            self.post("/api/internal/v1/vehicles/sync/", vehicle)
+            self.post(
+                "/api/internal/v1/vehicles/ABC-1/phases/sync/",
+                {"phases": [{"phase_slug": "phase-a", "order": 1}]},
+            )
+
+        queues = [call.kwargs["queue"] for call in dispatch.call_args_list]
+        assert queues == [sync_queue_for("ABC-1")] * 2
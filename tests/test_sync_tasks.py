@@ -0,0 +1,121 @@
+"""
+Tests de las tareas de sincronización individuales.
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.notifications.models import CustomerContactInfo, ServicePhase, Vehicle
+from apps.synchronization import tasks
+from apps.synchronization.tasks import (
+    sync_customer_task,
+    sync_global_phases_task,
+    sync_vehicle_task,
+)
+
+
+def _phase(slug, order):
+    return {"slug": slug, "name": slug.title(), "icon": "Calendar", "order": order}
+
+
+class TestUnchangedPayload(TestCase):
+    """Un reenvío idéntico de Core no reescribe la fila."""
+
+    def setUp(self):
+        cache.clear()
+        self.customer = {"customer_id": "CUST-1", "first_name": "Juan", "sync_version": 1}
+        self.vehicle = {
+            "vehicle_id": "VEH-1",
+            "customer_id": "CUST-1",
+            "plate": "ABC-1",
+            "brand": "Toyota",
+            "model": "Corolla",
+            "year": 2020,
+        }
+
+    def test_unchanged_customer_is_noop_without_queries(self):
+        """Un reenvío igual dentro de SYNC_TOUCH_INTERVAL no toca la base de datos."""
+        sync_customer_task(self.customer)
+
+        with self.assertNumQueries(0):
+            result = sync_customer_task(self.customer)
+
+        assert result["action"] == "noop"
+
+    def test_unchanged_customer_refreshes_last_synced_at_after_the_interval(self):
+        """Pasado el intervalo, el reenvío solo actualiza last_synced_at."""
+        sync_customer_task(self.customer)
+        first_sync = CustomerContactInfo.objects.get().last_synced_at
+
+        with mock.patch.object(tasks, "SYNC_TOUCH_INTERVAL", 0), mock.patch.object(
+            CustomerContactInfo.objects, "bulk_create"
+        ) as upsert:
+            result = sync_customer_task(self.customer)
+
+        assert result["action"] == "noop"
+        upsert.assert_not_called()
+        assert CustomerContactInfo.objects.get().last_synced_at > first_sync
+
+    def test_changed_customer_is_written(self):
+        """Un payload distinto sí se escribe."""
+        sync_customer_task(self.customer)
+
+        result = sync_customer_task({**self.customer, "first_name": "Pedro"})
+
+        assert result["action"] == "upserted"
+        assert CustomerContactInfo.objects.get().first_name == "Pedro"
+
+    def test_unchanged_vehicle_is_noop(self):
+        """Lo mismo para vehículos."""
+        sync_vehicle_task(self.vehicle)
+
+        unchanged = sync_vehicle_task(self.vehicle)
+        changed = sync_vehicle_task({**self.vehicle, "current_kilometers": 1000})
+
+        assert unchanged["action"] == "noop"
+        assert changed["action"] == "upserted"
+        assert Vehicle.objects.get().current_kilometers == 1000
+
+    def test_deleted_row_is_recreated(self):
+        """Si la fila se borró sin pasar por el ORM, el reenvío la vuelve a crear."""
+        sync_vehicle_task(self.vehicle)
+        Vehicle.objects.all()._raw_delete(Vehicle.objects.db)
+
+        with mock.patch.object(tasks, "SYNC_TOUCH_INTERVAL", 0):
+            result = sync_vehicle_task(self.vehicle)
+
+        assert result["action"] == "upserted"
+        assert Vehicle.objects.filter(plate="ABC-1").exists()
+
+
+class TestSyncGlobalPhasesTask(TestCase):
+    """Tests de sync_global_phases_task."""
+
+    def setUp(self):
+        cache.clear()
+        for order, slug in enumerate(["phase-a", "phase-b", "phase-c"], start=1):
+            ServicePhase.objects.create(**_phase(slug, order))
+
+    def test_full_sync_logs_the_deleted_slugs(self):
+        """El modo full elimina las fases ausentes y registra sus slugs tras el COMMIT."""
+        with self.assertLogs("apps.synchronization.tasks", level="WARNING") as logs:
+            with self.captureOnCommitCallbacks(execute=True):
+                result = sync_global_phases_task(
+                    {"sync_mode": "full", "phases": [_phase("phase-b", 1)]}
+                )
+
+        assert result["deleted"] == 2
+        assert result["updated"] == 1
+        assert list(ServicePhase.objects.values_list("slug", flat=True)) == ["phase-b"]
+        assert "['phase-a', 'phase-c']" in "\n".join(logs.output)
+
+    def test_partial_sync_keeps_missing_phases(self):
+        """El modo partial no elimina fases."""
+        result = sync_global_phases_task(
+            {"sync_mode": "partial", "phases": [_phase("phase-d", 4)]}
+        )
+
+        assert (result["created"], result["updated"], result["deleted"]) == (1, 0, 0)
+        assert ServicePhase.objects.count() == 4
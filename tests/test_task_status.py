@@ -0,0 +1,55 @@
+"""
+Tests de los endpoints de estado de tareas Celery.
+"""
+
+from celery import states
+from django.conf import settings
+from django.test import TestCase
+
+from apps.synchronization.tasks import sync_customer_task
+from apps.synchronization.views import TASK_STATUS_BULK_MAX
+
+
+class TestTaskStatusBulk(TestCase):
+    """GET /api/internal/v1/tasks/status/?ids=..."""
+
+    url = "/api/internal/v1/tasks/status/"
+
+    def setUp(self):
+        self.headers = {"HTTP_X_INTERNAL_SECRET": settings.INTERNAL_API_SECRET_KEY}
+        self.backend = sync_customer_task.app.backend
+
+    def get(self, ids):
+        return self.client.get(self.url, {"ids": ids}, **self.headers)
+
+    def test_returns_the_state_of_each_task(self):
+        """Cada id se reporta con su estado, en el orden pedido y sin repetidos."""
+        self.backend.store_result("task-ok", {"status": "success"}, states.SUCCESS)
+        self.backend.store_result("task-ko", ValueError("boom"), states.FAILURE)
+
+        response = self.get("task-ok,task-ko,task-unknown,task-ok")
+
+        assert response.status_code == 200
+        tasks = response.json()["tasks"]
+        assert [t["task_id"] for t in tasks] == ["task-ok", "task-ko", "task-unknown"]
+        ok, ko, unknown = tasks
+        assert (ok["status"], ok["successful"], ok["result"]) == (
+            states.SUCCESS,
+            True,
+            {"status": "success"},
+        )
+        assert (ko["status"], ko["failed"]) == (states.FAILURE, True)
+        assert "boom" in ko["error"]
+        assert (unknown["status"], unknown["ready"]) == (states.PENDING, False)
+
+    def test_requires_ids(self):
+        response = self.get("")
+
+        assert response.status_code == 400
+
+    def test_rejects_too_many_ids(self):
+        ids = ",".join(f"task-{i}" for i in range(TASK_STATUS_BULK_MAX + 1))
+
+        response = self.get(ids)
+
+        assert response.status_code == 400